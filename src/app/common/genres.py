@@ -5,7 +5,7 @@ This module contains all genre-related constants, configurations, and helper fun
 """
 
 import json
-from typing import List, Optional
+from typing import Iterable, List, Optional, Union
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
 
@@ -29,33 +29,55 @@ GENRES = [
 ]
 
 
-def serialize_genres(genres: List[str]) -> str:
+# Har bir janr uchun bitta bit - 15 ta janr 16-bitli maskaga sig'adi
+GENRE_BITS = {g["name"]: 1 << i for i, g in enumerate(GENRES)}
+
+
+def genres_to_mask(genres: Optional[Iterable[str]]) -> int:
     """
-    Convert list of genre names to JSON string for database storage.
+    Convert genre names to a bitmask (unknown names are ignored).
+    
+    Args:
+        genres: Genre names
+        
+    Returns:
+        Bitmask with one bit per genre from GENRES
+    """
+    mask = 0
+    for name in genres or ():
+        mask |= GENRE_BITS.get(name, 0)
+    return mask
+
+
+def serialize_genres(genres: List[str]) -> List[str]:
+    """
+    Convert list of genre names to the value stored in the text[] column.
     
     Args:
         genres: List of genre names
         
     Returns:
-        JSON string representation
+        De-duplicated list of genre names (order preserved)
     """
-    return json.dumps(genres, ensure_ascii=False)
+    return list(dict.fromkeys(genres))
 
 
-def deserialize_genres(genres_json: Optional[str]) -> List[str]:
+def deserialize_genres(genres: Optional[Union[List[str], str]]) -> List[str]:
     """
-    Convert JSON string from database to list of genre names.
+    Convert a genres value from the database to list of genre names.
     
     Args:
-        genres_json: JSON string from database
+        genres: text[] value from database, or a legacy JSON string
         
     Returns:
         List of genre names, empty list if None or invalid
     """
-    if not genres_json:
+    if not genres:
         return []
+    if isinstance(genres, (list, tuple)):
+        return list(genres)
     try:
-        return json.loads(genres_json)
+        return json.loads(genres)
     except (json.JSONDecodeError, TypeError):
         return []
 
@@ -11,4 +11,8 @@ class Settings:
     db_password = env.str("POSTGRES_PASSWORD")
     db_host = env.str("POSTGRES_HOST")
     db_port = env.str("POSTGRES_PORT")
-    redis_url = env.str("REDIS_URL")
\ No newline at end of file
+    redis_url = env.str("REDIS_URL")
+    # Kunlik all_users.txt faqat oxirgi yuborishdan keyin qo'shilganlarni o'z ichiga oladi
+    daily_export_delta = env.bool("DAILY_EXPORT_DELTA", False)
+    # Statistika users jadvali o'rniga registration_counters'dan o'qiladi
+    stats_from_counters = env.bool("STATS_FROM_COUNTERS", False)
@@ -0,0 +1,140 @@
+"""
+Bulk export/restore of the main tables with PostgreSQL COPY.
+
+Usage:
+    python -m src.app.database.copy_transfer export <dir> [--format binary|csv] [--tables users favorites ...]
+    python -m src.app.database.copy_transfer import <dir> [--format binary|csv] [--tables users favorites ...]
+
+Restore loads each file into a temporary staging table and merges it with
+INSERT ... ON CONFLICT DO NOTHING, so existing rows are kept and the
+command can be re-run safely. Restart the bot after a restore so in-memory
+indexes are rebuilt.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+
+import asyncpg
+
+from src.app.database.core import Base
+from src.app.database import models  # noqa: F401  (registers tables in Base.metadata)
+
+logger = logging.getLogger(__name__)
+
+COPY_TABLES = ("users", "favorites", "feature_films", "series", "mini_series")
+COPY_FORMATS = ("binary", "csv")
+
+
+def copy_file_name(table: str, fmt: str = "binary") -> str:
+    return f"{table}.{'copy' if fmt == 'binary' else 'csv'}"
+
+
+def _columns(table: str) -> list[str]:
+    # Explicit column list: physical column order may differ between databases
+    # (e.g. after the genres text -> text[] migration)
+    return [column.name for column in Base.metadata.tables[table].columns]
+
+
+def _quoted(columns: list[str]) -> str:
+    return ", ".join(f'"{column}"' for column in columns)
+
+
+async def export_tables(
+        conn: asyncpg.Connection,
+        directory: str,
+        tables: tuple[str, ...] = COPY_TABLES,
+        fmt: str = "binary",
+) -> dict[str, int]:
+    """
+    COPY each table into `directory` as `<table>.copy` (binary) or `<table>.csv`
+
+    Returns:
+        Rows exported per table
+    """
+    counts = {}
+    for table in tables:
+        path = os.path.join(directory, copy_file_name(table, fmt))
+        status = await conn.copy_from_table(
+            table,
+            columns=_columns(table),
+            output=path,
+            format=fmt,
+            header=True if fmt == "csv" else None,
+        )
+        counts[table] = int(status.split()[-1])
+        logger.info(f"COPY export {table}: {counts[table]} rows -> {path}")
+    return counts
+
+
+async def import_tables(
+        conn: asyncpg.Connection,
+        directory: str,
+        tables: tuple[str, ...] = COPY_TABLES,
+        fmt: str = "binary",
+) -> dict[str, int]:
+    """
+    Restore tables from COPY files in `directory` (missing files are skipped)
+
+    Returns:
+        Rows inserted per table (rows that already existed are not counted)
+    """
+    counts = {}
+    for table in tables:
+        path = os.path.join(directory, copy_file_name(table, fmt))
+        if not os.path.exists(path):
+            logger.warning(f"COPY import {table}: {path} not found, skipped")
+            continue
+
+        columns = _columns(table)
+        stage = f"_restore_{table}"
+        async with conn.transaction():
+            await conn.execute(f'CREATE TEMP TABLE "{stage}" (LIKE "{table}" INCLUDING DEFAULTS) ON COMMIT DROP')
+            await conn.copy_to_table(
+                stage,
+                source=path,
+                columns=columns,
+                format=fmt,
+                header=True if fmt == "csv" else None,
+            )
+            status = await conn.execute(
+                f'INSERT INTO "{table}" ({_quoted(columns)}) '
+                f'SELECT {_quoted(columns)} FROM "{stage}" ON CONFLICT DO NOTHING'
+            )
+        counts[table] = int(status.split()[-1])
+        logger.info(f"COPY import {table}: {counts[table]} rows inserted from {path}")
+    return counts
+
+
+async def _run_cli(args: argparse.Namespace) -> None:
+    from src.app.core.config import Settings
+    from src.app.database.database_dsn import construct_postgresql_url
+
+    dsn = construct_postgresql_url(Settings()).replace("postgresql+asyncpg://", "postgresql://", 1)
+    conn = await asyncpg.connect(dsn)
+    try:
+        if args.command == "export":
+            os.makedirs(args.directory, exist_ok=True)
+            counts = await export_tables(conn, args.directory, tuple(args.tables), args.format)
+        else:
+            counts = await import_tables(conn, args.directory, tuple(args.tables), args.format)
+    finally:
+        await conn.close()
+
+    for table, count in counts.items():
+        print(f"{table}: {count}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="COPY-based export/restore of bot tables")
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("directory")
+    parser.add_argument("--format", choices=COPY_FORMATS, default="binary")
+    parser.add_argument("--tables", nargs="+", choices=COPY_TABLES, default=list(COPY_TABLES))
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run_cli(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,9 +8,17 @@ from aiogram import Bot
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from src.app.database.queries.user import UserActions
+from src.app.services.cache_service import CacheService
 
 logger = logging.getLogger(__name__)
 
+EXPORT_BUFFER_LINES = 10000
+EXPORT_WATERMARK_KEY = "daily_export:watermark"
+# created_at is the inserting transaction's start time, so a row can commit
+# after newer rows were already exported. Delta exports stop this far behind
+# the DB clock, letting such late commits land before the watermark passes them.
+EXPORT_SAFETY_LAG = datetime.timedelta(minutes=1)
+
 
 async def send_database_to_owner(bot: Bot, chat_ids: list[int], db_path: str):
     is_file_exists = await asyncio.to_thread(os.path.exists, db_path)
@@ -28,18 +36,71 @@ async def send_database_to_owner(bot: Bot, chat_ids: list[int], db_path: str):
         await asyncio.gather(*tasks)
 
 
-async def daily_database_sender(bot: Bot, chat_ids: list[int], session_pool: async_sessionmaker) -> None:
-    while True:
-        try:
-            async with session_pool() as session:
-                user_actions = UserActions(session)
-                all_users = await user_actions.get_all_user()
+async def export_user_ids(
+        session_pool: async_sessionmaker,
+        path: str,
+        created_after: datetime.datetime | None = None,
+        created_before: datetime.datetime | None = None,
+) -> int:
+    """
+    Stream user ids into `path`, one per line, with buffered writes
+
+    Returns:
+        Exported count
+    """
+    count = 0
+    buffer: list[str] = []
+
+    async with session_pool() as session, aiofiles.open(path, "w", encoding="utf-8") as f:
+        async for tg_id, _ in UserActions(session).stream_user_ids(created_after, created_before):
+            buffer.append(f"{tg_id}\n")
+            count += 1
+            if len(buffer) >= EXPORT_BUFFER_LINES:
+                await f.write("".join(buffer))
+                buffer.clear()
+
+        if buffer:
+            await f.write("".join(buffer))
+
+    return count
+
+
+async def _get_watermark(redis_url: str) -> datetime.datetime | None:
+    try:
+        redis = await CacheService.get_redis(redis_url)
+        value = await redis.get(EXPORT_WATERMARK_KEY)
+    except Exception as e:
+        logger.error(f"Export watermark read error: {e}")
+        return None
+    return datetime.datetime.fromisoformat(value) if value else None
 
-            async with aiofiles.open("all_users.txt", "w", encoding="utf-8") as f:
-                for user in all_users:
-                    # user is now a User object, so we access .tg_id
-                    await f.write(f"{user.tg_id}\n")
 
+async def _set_watermark(redis_url: str, value: datetime.datetime) -> None:
+    try:
+        redis = await CacheService.get_redis(redis_url)
+        await redis.set(EXPORT_WATERMARK_KEY, value.isoformat())
+    except Exception as e:
+        logger.error(f"Export watermark write error: {e}")
+
+
+async def daily_database_sender(
+        bot: Bot,
+        chat_ids: list[int],
+        session_pool: async_sessionmaker,
+        redis_url: str,
+        delta: bool = False,
+) -> None:
+    """
+    Send all_users.txt to admins every midnight
+
+    The file is generated right before sending. In delta mode only users
+    registered after the previous successful send are exported (the
+    watermark is kept in Redis; without it a full export is sent). The
+    window ends EXPORT_SAFETY_LAG behind the DB clock and the watermark
+    moves to that cutoff, so late-committing rows are picked up next time.
+    """
+    while True:
+        try:
             now = datetime.datetime.now()
             target_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
@@ -49,7 +110,21 @@ async def daily_database_sender(bot: Bot, chat_ids: list[int], session_pool: asy
             sleep_duration = (target_time - now).total_seconds()
             await asyncio.sleep(sleep_duration)
 
-            await send_database_to_owner(bot, chat_ids, "all_users.txt")
+            watermark = cutoff = None
+            if delta:
+                watermark = await _get_watermark(redis_url)
+                async with session_pool() as session:
+                    cutoff = await UserActions(session).get_created_cutoff(EXPORT_SAFETY_LAG)
+
+            count = await export_user_ids(session_pool, "all_users.txt", watermark, cutoff)
+            logger.info(f"Daily user export: {count} ids (since {watermark or 'beginning'})")
+
+            # Telegram rejects empty files (delta mode may have no new users)
+            if count:
+                await send_database_to_owner(bot, chat_ids, "all_users.txt")
+
+            if delta:
+                await _set_watermark(redis_url, cutoff)
 
         except Exception as e:
             logger.exception(e)
@@ -0,0 +1,95 @@
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+logger = logging.getLogger(__name__)
+
+GENRE_TABLES = ("feature_films", "series", "mini_series")
+
+
+async def _column_type(conn: AsyncConnection, table: str, column: str) -> str | None:
+    result = await conn.execute(
+        text(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = :table AND column_name = :column"
+        ),
+        {"table": table, "column": column},
+    )
+    return result.scalar_one_or_none()
+
+
+# Per-row JSON -> text[] conversion; malformed values become NULL instead of
+# aborting the whole UPDATE (pg_temp: dropped with the connection's session)
+LEGACY_GENRES_FUNCTION = """
+CREATE OR REPLACE FUNCTION pg_temp.legacy_genres_to_array(value text) RETURNS text[]
+LANGUAGE plpgsql IMMUTABLE AS $$
+BEGIN
+    RETURN ARRAY(SELECT json_array_elements_text(value::json));
+EXCEPTION WHEN invalid_text_representation OR invalid_parameter_value THEN
+    -- Not valid JSON, or valid JSON that isn't an array
+    RETURN NULL;
+END
+$$
+"""
+
+
+async def migrate_genres_to_array(conn: AsyncConnection) -> None:
+    """Convert legacy JSON-in-Text `genres` columns to text[] and add GIN indexes.
+
+    ALTER COLUMN ... USING can't contain a subquery, so the JSON array is
+    expanded into a new column, then swapped in. Values that aren't a JSON
+    array end up as NULL, same as deserialize_genres used to return [].
+    """
+    for table in GENRE_TABLES:
+        if await _column_type(conn, table, "genres") == "text":
+            logger.info(f"Migrating {table}.genres to text[]")
+            await conn.execute(text(LEGACY_GENRES_FUNCTION))
+            await conn.execute(text(f"ALTER TABLE {table} ADD COLUMN genres_arr text[]"))
+            await conn.execute(text(
+                f"""
+                UPDATE {table}
+                SET genres_arr = pg_temp.legacy_genres_to_array(genres)
+                WHERE genres IS NOT NULL
+                """
+            ))
+            await conn.execute(text(f"ALTER TABLE {table} DROP COLUMN genres"))
+            await conn.execute(text(f"ALTER TABLE {table} RENAME COLUMN genres_arr TO genres"))
+
+        await conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_genres ON {table} USING gin (genres)"))
+
+
+async def add_users_created_at_index(conn: AsyncConnection) -> None:
+    """Index for the registration stats range filters (create_all skips existing tables)."""
+    await conn.execute(text("CREATE INDEX IF NOT EXISTS ix_users_created_at ON users (created_at)"))
+
+
+async def add_broadcast_job_error(conn: AsyncConnection) -> None:
+    """broadcast_jobs.error for tables created before the column existed."""
+    await conn.execute(text("ALTER TABLE broadcast_jobs ADD COLUMN IF NOT EXISTS error text"))
+
+
+async def backfill_registration_counters(conn: AsyncConnection) -> None:
+    """Fill registration_counters from users once, when the table is still empty.
+
+    After that UserActions.add_user keeps it up to date.
+    """
+    result = await conn.execute(text(
+        """
+        INSERT INTO registration_counters (day, language_code, registrations, premium)
+        SELECT created_at::date, COALESCE(language_code, 'unknown'), count(*), count(*) FILTER (WHERE is_premium)
+        FROM users
+        WHERE NOT EXISTS (SELECT 1 FROM registration_counters)
+        GROUP BY 1, 2
+        """
+    ))
+    if result.rowcount:
+        logger.info(f"Backfilled registration_counters: {result.rowcount} rows")
+
+
+async def run_migrations(conn: AsyncConnection) -> None:
+    """One-shot schema upgrades for databases created by older versions (idempotent)."""
+    await migrate_genres_to_array(conn)
+    await add_users_created_at_index(conn)
+    await backfill_registration_counters(conn)
+    await add_broadcast_job_error(conn)
@@ -1,5 +1,6 @@
-from datetime import datetime
-from sqlalchemy import BigInteger, Text, DateTime, func
+from datetime import date, datetime
+from sqlalchemy import BigInteger, Date, Text, DateTime, Index, func
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column
 from src.app.database.core import Base
 
@@ -12,7 +13,7 @@ class User(Base):
     status: Mapped[str] = mapped_column(Text, nullable=False)
     language_code: Mapped[str | None] = mapped_column(Text, nullable=True)
     is_premium: Mapped[bool] = mapped_column(server_default="false", nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), server_default=func.now(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), server_default=func.now(), nullable=False, index=True)
 
 
 class Channel(Base):
@@ -48,17 +49,19 @@ class Referral(Base):
 
 class FeatureFilm(Base):
     __tablename__ = "feature_films"
+    __table_args__ = (Index("ix_feature_films_genres", "genres", postgresql_using="gin"),)
 
     code: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     name: Mapped[str] = mapped_column(Text, nullable=False, index=True)
     video_file_id: Mapped[str] = mapped_column(Text, nullable=False)
     captions: Mapped[str | None] = mapped_column(Text, nullable=True)
-    genres: Mapped[str | None] = mapped_column(Text, nullable=True)
+    genres: Mapped[list[str] | None] = mapped_column(ARRAY(Text), nullable=True)
     views_count: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
 
 
 class Series(Base):
     __tablename__ = "series"
+    __table_args__ = (Index("ix_series_genres", "genres", postgresql_using="gin"),)
 
     code: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     season: Mapped[int] = mapped_column(BigInteger, primary_key=True)
@@ -66,19 +69,20 @@ class Series(Base):
     name: Mapped[str] = mapped_column(Text, nullable=False, index=True)
     video_file_id: Mapped[str] = mapped_column(Text, nullable=False)
     captions: Mapped[str | None] = mapped_column(Text, nullable=True)
-    genres: Mapped[str | None] = mapped_column(Text, nullable=True)
+    genres: Mapped[list[str] | None] = mapped_column(ARRAY(Text), nullable=True)
     views_count: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
 
 
 class MiniSeries(Base):
     __tablename__ = "mini_series"
+    __table_args__ = (Index("ix_mini_series_genres", "genres", postgresql_using="gin"),)
 
     code: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     series: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     name: Mapped[str] = mapped_column(Text, nullable=False, index=True)
     video_file_id: Mapped[str] = mapped_column(Text, nullable=False)
     captions: Mapped[str | None] = mapped_column(Text, nullable=True)
-    genres: Mapped[str | None] = mapped_column(Text, nullable=True)
+    genres: Mapped[list[str] | None] = mapped_column(ARRAY(Text), nullable=True)
     views_count: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
 
 
@@ -88,3 +92,43 @@ class Favorite(Base):
     user_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     movie_code: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), server_default=func.now(), nullable=False)
+
+
+class ViewBucket(Base):
+    __tablename__ = "view_buckets"
+
+    bucket: Mapped[datetime] = mapped_column(DateTime(timezone=False), primary_key=True)
+    movie_code: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    views: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
+
+
+class BroadcastJob(Base):
+    __tablename__ = "broadcast_jobs"
+
+    job_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    admin_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    from_chat_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    message_ids: Mapped[list[int]] = mapped_column(ARRAY(BigInteger), nullable=False)
+    reply_markup: Mapped[str | None] = mapped_column(Text, nullable=True)
+    status: Mapped[str] = mapped_column(Text, server_default="pending", nullable=False)
+    last_user_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    sent: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
+    failed: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
+    blocked: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
+    deleted: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
+    limited: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
+    deactivated: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
+    claimed_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=False), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), server_default=func.now(), nullable=False)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=False), nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+
+class RegistrationCounter(Base):
+    __tablename__ = "registration_counters"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    language_code: Mapped[str] = mapped_column(Text, primary_key=True)
+    registrations: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
+    premium: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
@@ -1,27 +1,33 @@
+from typing import AsyncIterator
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.app.database.models import User, FeatureFilm, Series, MiniSeries, Favorite
 
 class BackupQueries:
+    # Rows fetched per round-trip from the server-side cursor
+    STREAM_BATCH = 2000
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_all_users(self) -> list[User]:
-        result = await self.session.execute(select(User).order_by(User.created_at.asc()))
-        return list(result.scalars().all())
+    async def _stream(self, stmt) -> AsyncIterator[dict]:
+        """Yield plain column dicts through a server-side cursor - memory stays constant."""
+        result = await self.session.stream(stmt.execution_options(yield_per=self.STREAM_BATCH))
+        async for row in result.mappings():
+            yield dict(row)
+
+    def stream_users(self) -> AsyncIterator[dict]:
+        return self._stream(select(*User.__table__.columns).order_by(User.created_at.asc()))
 
-    async def get_all_feature_films(self) -> list[FeatureFilm]:
-        result = await self.session.execute(select(FeatureFilm))
-        return list(result.scalars().all())
+    def stream_feature_films(self) -> AsyncIterator[dict]:
+        return self._stream(select(*FeatureFilm.__table__.columns))
 
-    async def get_all_series(self) -> list[Series]:
-        result = await self.session.execute(select(Series))
-        return list(result.scalars().all())
+    def stream_series(self) -> AsyncIterator[dict]:
+        return self._stream(select(*Series.__table__.columns))
 
-    async def get_all_mini_series(self) -> list[MiniSeries]:
-        result = await self.session.execute(select(MiniSeries))
-        return list(result.scalars().all())
+    def stream_mini_series(self) -> AsyncIterator[dict]:
+        return self._stream(select(*MiniSeries.__table__.columns))
 
-    async def get_all_favorites(self) -> list[Favorite]:
-        result = await self.session.execute(select(Favorite))
-        return list(result.scalars().all())
+    def stream_favorites(self) -> AsyncIterator[dict]:
+        return self._stream(select(*Favorite.__table__.columns))
@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.database.models import BroadcastJob
+
+# Незавершённые задачи - их подхватывает (или продолжает после рестарта) воркер
+ACTIVE_STATUSES = ("pending", "running")
+
+
+class BroadcastJobActions:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_job(
+            self,
+            admin_id: int,
+            from_chat_id: int,
+            message_ids: list[int],
+            reply_markup: str | None = None,
+    ) -> BroadcastJob:
+        job = BroadcastJob(
+            admin_id=admin_id,
+            from_chat_id=from_chat_id,
+            message_ids=message_ids,
+            reply_markup=reply_markup,
+        )
+        self.session.add(job)
+        await self.session.commit()
+        await self.session.refresh(job)
+        return job
+
+    async def get_job(self, job_id: int) -> BroadcastJob | None:
+        stmt = select(BroadcastJob).where(BroadcastJob.job_id == job_id)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_latest_job(self) -> BroadcastJob | None:
+        stmt = select(BroadcastJob).order_by(BroadcastJob.job_id.desc()).limit(1)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def claim_next_job(self, lease: timedelta) -> BroadcastJob | None:
+        """
+        Take the oldest unfinished job whose lease has expired.
+
+        The lease is renewed on every checkpoint, so a job left 'running' by a
+        stopped process becomes claimable again once its lease runs out.
+        """
+        candidate = (
+            select(BroadcastJob.job_id)
+            .where(
+                BroadcastJob.status.in_(ACTIVE_STATUSES),
+                (BroadcastJob.claimed_until.is_(None)) | (BroadcastJob.claimed_until < func.now()),
+            )
+            .order_by(BroadcastJob.job_id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(BroadcastJob)
+            .where(BroadcastJob.job_id == candidate)
+            .values(status="running", claimed_until=func.now() + lease, updated_at=func.now())
+            .returning(BroadcastJob)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        job = result.scalar_one_or_none()
+        await self.session.commit()
+        return job
+
+    async def save_checkpoint(self, job_id: int, last_user_id: int | None, counters: dict[str, int], lease: timedelta):
+        """Persist progress (last fully processed tg_id + counters) and renew the lease."""
+        stmt = (
+            update(BroadcastJob)
+            .where(BroadcastJob.job_id == job_id)
+            .values(
+                last_user_id=last_user_id,
+                claimed_until=func.now() + lease,
+                updated_at=func.now(),
+                **counters,
+            )
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
+
+    async def finish_job(self, job_id: int, status: str, counters: dict[str, int], error: str | None = None):
+        stmt = (
+            update(BroadcastJob)
+            .where(BroadcastJob.job_id == job_id)
+            .values(
+                status=status,
+                error=error,
+                claimed_until=None,
+                updated_at=func.now(),
+                finished_at=func.now(),
+                **counters,
+            )
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
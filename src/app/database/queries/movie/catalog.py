@@ -0,0 +1,145 @@
+from dataclasses import dataclass
+import logging
+
+from sqlalchemy import select, func, literal, union_all, exists
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.database.models import FeatureFilm, Series, MiniSeries, Favorite
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogTitle:
+    """Kod bo'yicha topilgan kontent va uning birinchi qismi haqida qisqa ma'lumot"""
+
+    kind: str  # 'feature_film' | 'series' | 'mini_series'
+    code: int
+    name: str
+    video_file_id: str
+    captions: str | None
+    season: int  # birinchi qism fasli (film va mini-serial uchun 1)
+    series: int  # birinchi qism raqami (film uchun 1)
+    episodes_count: int
+    seasons_count: int
+    first_season_episodes_count: int
+    saved: bool
+
+
+class CatalogActions:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def resolve(self, code: int, user_id: int) -> CatalogTitle | None:
+        """Resolve a code across all three tables plus the favorites flag in one statement.
+
+        Precedence matches the old sequential lookups: feature film, then
+        mini-series, then series.
+        """
+        try:
+            saved = exists().where(Favorite.user_id == user_id, Favorite.movie_code == code)
+
+            feature_query = (
+                select(
+                    literal(0).label("priority"),
+                    literal("feature_film").label("kind"),
+                    FeatureFilm.code.label("code"),
+                    FeatureFilm.name.label("name"),
+                    FeatureFilm.video_file_id.label("video_file_id"),
+                    FeatureFilm.captions.label("captions"),
+                    literal(1).label("season"),
+                    literal(1).label("series"),
+                    literal(1).label("episodes_count"),
+                    literal(1).label("seasons_count"),
+                    literal(1).label("first_season_episodes_count"),
+                    saved.label("saved"),
+                )
+                .where(FeatureFilm.code == code)
+            )
+
+            # Agregatlar uchun alohida alias - aks holda tashqi so'rovga korrelyatsiya qilinadi
+            mini_episodes = aliased(MiniSeries)
+            mini_count = select(func.count()).select_from(mini_episodes).where(mini_episodes.code == code).scalar_subquery()
+            mini_query = (
+                select(
+                    literal(1).label("priority"),
+                    literal("mini_series").label("kind"),
+                    MiniSeries.code.label("code"),
+                    MiniSeries.name.label("name"),
+                    MiniSeries.video_file_id.label("video_file_id"),
+                    MiniSeries.captions.label("captions"),
+                    literal(1).label("season"),
+                    MiniSeries.series.label("series"),
+                    mini_count.label("episodes_count"),
+                    literal(1).label("seasons_count"),
+                    mini_count.label("first_season_episodes_count"),
+                    saved.label("saved"),
+                )
+                .where(MiniSeries.code == code)
+                .order_by(MiniSeries.series)
+                .limit(1)
+                .subquery()
+            )
+
+            all_episodes = aliased(Series)
+            season_episodes = aliased(Series)
+            series_query = (
+                select(
+                    literal(2).label("priority"),
+                    literal("series").label("kind"),
+                    Series.code.label("code"),
+                    Series.name.label("name"),
+                    Series.video_file_id.label("video_file_id"),
+                    Series.captions.label("captions"),
+                    Series.season.label("season"),
+                    Series.series.label("series"),
+                    select(func.count())
+                    .select_from(all_episodes)
+                    .where(all_episodes.code == code)
+                    .scalar_subquery()
+                    .label("episodes_count"),
+                    select(func.max(all_episodes.season))
+                    .where(all_episodes.code == code)
+                    .scalar_subquery()
+                    .label("seasons_count"),
+                    select(func.count())
+                    .select_from(season_episodes)
+                    .where(season_episodes.code == code, season_episodes.season == Series.season)
+                    .scalar_subquery()
+                    .label("first_season_episodes_count"),
+                    saved.label("saved"),
+                )
+                .where(Series.code == code)
+                .order_by(Series.season, Series.series)
+                .limit(1)
+                .subquery()
+            )
+
+            combined = union_all(
+                feature_query,
+                select(mini_query),
+                select(series_query),
+            ).subquery()
+
+            stmt = select(combined).order_by(combined.c.priority).limit(1)
+            row = (await self.session.execute(stmt)).first()
+            if row is None:
+                return None
+
+            return CatalogTitle(
+                kind=row.kind,
+                code=row.code,
+                name=row.name,
+                video_file_id=row.video_file_id,
+                captions=row.captions,
+                season=row.season,
+                series=row.series,
+                episodes_count=row.episodes_count,
+                seasons_count=row.seasons_count,
+                first_season_episodes_count=row.first_season_episodes_count,
+                saved=bool(row.saved),
+            )
+        except Exception as e:
+            logger.error(f"Error resolving catalog code {code}: {e}")
+            return None
@@ -1,8 +1,8 @@
-from sqlalchemy import select, delete, func
+from sqlalchemy import select, delete, func, literal, union_all
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.database.models import Favorite
+from src.app.database.models import Favorite, FeatureFilm, Series, MiniSeries
 
 
 class FavoriteMoviesActions:
@@ -13,11 +13,13 @@ class FavoriteMoviesActions:
             self,
             movie_code: int,
             user_id: int
-    ):
+    ) -> bool:
+        """Returns True if a new favorite row was inserted."""
         stmt = insert(Favorite).values(user_id=user_id, movie_code=movie_code)
         stmt = stmt.on_conflict_do_nothing(index_elements=['user_id', 'movie_code'])
-        await self.session.execute(stmt)
+        result = await self.session.execute(stmt)
         await self.session.commit()
+        return result.rowcount > 0
 
     async def get_favorites(
             self,
@@ -33,6 +35,55 @@ class FavoriteMoviesActions:
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def get_favorite_codes(self, user_id: int) -> list[int]:
+        stmt = select(Favorite.movie_code).where(Favorite.user_id == user_id)
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_favorite_titles_page(
+            self,
+            user_id: int,
+            offset: int = 0,
+            limit: int = 20
+    ) -> tuple[list[tuple[int, str, str]], int]:
+        """Resolve one page of a user's favorites to titles in a single query.
+
+        Returns:
+            ([(code, name, kind), ...], total) - newest first; codes whose
+            title no longer exists are skipped and not counted.
+        """
+        # Har bir jadvaldan faqat foydalanuvchi kodlari - PK indeks bo'yicha
+        user_codes = select(Favorite.movie_code).where(Favorite.user_id == user_id)
+        titles = union_all(
+            select(FeatureFilm.code.label("code"), FeatureFilm.name.label("name"), literal("feature_film").label("kind"))
+            .where(FeatureFilm.code.in_(user_codes)),
+            select(MiniSeries.code, func.max(MiniSeries.name), literal("mini_series"))
+            .where(MiniSeries.code.in_(user_codes))
+            .group_by(MiniSeries.code),
+            select(Series.code, func.max(Series.name), literal("series"))
+            .where(Series.code.in_(user_codes))
+            .group_by(Series.code),
+        ).subquery()
+
+        stmt = (
+            select(titles.c.code, titles.c.name, titles.c.kind, func.count().over().label("total"))
+            .join(Favorite, Favorite.movie_code == titles.c.code)
+            .where(Favorite.user_id == user_id)
+            .order_by(Favorite.created_at.desc(), titles.c.code)
+            .offset(offset)
+            .limit(limit)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        if not rows and offset:
+            # Sahifa oxiridan o'tib ketgan - faqat umumiy sonni olamiz
+            total = await self.session.scalar(
+                select(func.count()).select_from(titles).join(Favorite, Favorite.movie_code == titles.c.code)
+                .where(Favorite.user_id == user_id)
+            )
+            return [], total or 0
+        total = rows[0].total if rows else 0
+        return [(row.code, row.name, row.kind) for row in rows], total
+
     async def get_all_favorites(self):
         stmt = select(Favorite)
         result = await self.session.execute(stmt)
@@ -70,7 +121,9 @@ class FavoriteMoviesActions:
         result = await self.session.execute(stmt)
         return result.all()
 
-    async def delete_favorite_movie(self, movie_code: int, user_id: int):
+    async def delete_favorite_movie(self, movie_code: int, user_id: int) -> bool:
+        """Returns True if a favorite row was deleted."""
         stmt = delete(Favorite).where(Favorite.user_id == user_id, Favorite.movie_code == movie_code)
-        await self.session.execute(stmt)
+        result = await self.session.execute(stmt)
         await self.session.commit()
+        return result.rowcount > 0
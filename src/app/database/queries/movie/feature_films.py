@@ -1,6 +1,7 @@
 from typing import Sequence
 
-from sqlalchemy import select, delete, update, func
+from sqlalchemy import select, delete, update, func, bindparam, BigInteger
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
@@ -19,7 +20,7 @@ class FeatureFilmsActions:
             film_name: str,
             video_file_id: str,
             caption: str,
-            genres: str = None,
+            genres: list[str] = None,
     ):
         film = FeatureFilm(
             code=film_code,
@@ -50,6 +51,23 @@ class FeatureFilmsActions:
         await self.session.execute(stmt)
         await self.session.commit()
 
+
+    async def bulk_increment_views(self, counts: dict[int, int]):
+        """Apply accumulated view counts in a single UPDATE ... FROM unnest(...)."""
+        if not counts:
+            return
+        deltas = func.unnest(
+            bindparam("codes", list(counts), type_=ARRAY(BigInteger)),
+            bindparam("deltas", list(counts.values()), type_=ARRAY(BigInteger)),
+        ).table_valued("code", "delta")
+        stmt = (
+            update(FeatureFilm)
+            .where(FeatureFilm.code == deltas.c.code)
+            .values(views_count=FeatureFilm.views_count + deltas.c.delta)
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
+
     async def delete_feature_film(self, film_code: int):
         stmt = delete(FeatureFilm).where(FeatureFilm.code == film_code)
         await self.session.execute(stmt)
@@ -66,7 +84,7 @@ class FeatureFilmsActions:
         await self.session.execute(stmt)
         await self.session.commit()
 
-    async def update_genres(self, film_code: int, genres: str) -> None:
+    async def update_genres(self, film_code: int, genres: list[str]) -> None:
         """Update genres for a feature film."""
         stmt = update(FeatureFilm).where(FeatureFilm.code == film_code).values(genres=genres)
         await self.session.execute(stmt)
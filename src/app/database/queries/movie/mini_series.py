@@ -1,4 +1,5 @@
-from sqlalchemy import select, delete, update, func
+from sqlalchemy import select, delete, update, func, literal, bindparam, BigInteger
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
@@ -18,7 +19,7 @@ class MiniSeriesActions:
             series: int,
             video_file_id: str,
             caption: str,
-            genres: str = None,
+            genres: list[str] = None,
     ):
         ms = MiniSeries(
             code=mini_series_code,
@@ -45,6 +46,16 @@ class MiniSeriesActions:
             logger.error(f"Error getting mini series {mini_series_code}: {e}")
             return []
 
+    async def get_episode_rows(self, mini_series_code: int) -> list[tuple[int, int, str, str | None]]:
+        """Lightweight (season, series, video_file_id, captions) rows; season is always 1."""
+        stmt = (
+            select(literal(1), MiniSeries.series, MiniSeries.video_file_id, MiniSeries.captions)
+            .where(MiniSeries.code == mini_series_code)
+            .order_by(MiniSeries.series)
+        )
+        result = await self.session.execute(stmt)
+        return [tuple(row) for row in result.all()]
+
     async def delete_mini_series(self, mini_series_code: int):
         stmt = delete(MiniSeries).where(MiniSeries.code == mini_series_code)
         await self.session.execute(stmt)
@@ -119,13 +130,13 @@ class MiniSeriesActions:
         await self.session.execute(stmt)
         await self.session.commit()
 
-    async def update_genres(self, mini_series_code: int, genres: str) -> None:
+    async def update_genres(self, mini_series_code: int, genres: list[str]) -> None:
         """Update genres for all episodes of a mini-series code."""
         stmt = update(MiniSeries).where(MiniSeries.code == mini_series_code).values(genres=genres)
         await self.session.execute(stmt)
         await self.session.commit()
 
-    async def get_genres_by_code(self, mini_series_code: int) -> str | None:
+    async def get_genres_by_code(self, mini_series_code: int) -> list[str] | None:
         """Get genres for a mini-series code (from first available episode)."""
         stmt = select(MiniSeries.genres).where(MiniSeries.code == mini_series_code).limit(1)
         result = await self.session.execute(stmt)
@@ -191,3 +202,21 @@ class MiniSeriesActions:
         )
         await self.session.execute(stmt)
         await self.session.commit()
+
+    async def bulk_increment_views(self, counts: dict[tuple[int, int], int]):
+        """Apply accumulated view counts keyed by (code, series) in one statement."""
+        if not counts:
+            return
+        codes, series_nums = zip(*counts)
+        deltas = func.unnest(
+            bindparam("codes", list(codes), type_=ARRAY(BigInteger)),
+            bindparam("series_nums", list(series_nums), type_=ARRAY(BigInteger)),
+            bindparam("deltas", list(counts.values()), type_=ARRAY(BigInteger)),
+        ).table_valued("code", "series", "delta")
+        stmt = (
+            update(MiniSeries)
+            .where(MiniSeries.code == deltas.c.code, MiniSeries.series == deltas.c.series)
+            .values(views_count=MiniSeries.views_count + deltas.c.delta)
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
@@ -1,4 +1,5 @@
-from sqlalchemy import select, delete, update, func
+from sqlalchemy import select, delete, update, func, bindparam, BigInteger
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
@@ -19,7 +20,7 @@ class SeriesActions:
             season: int,
             video_file_id: str,
             caption: str,
-            genres: str = None,
+            genres: list[str] = None,
     ):
         s = Series(
             code=series_code,
@@ -47,6 +48,16 @@ class SeriesActions:
             logger.error(f"Error getting series {series_code}: {e}")
             return []
 
+    async def get_episode_rows(self, series_code: int) -> list[tuple[int, int, str, str | None]]:
+        """Lightweight (season, series, video_file_id, captions) rows without ORM objects."""
+        stmt = (
+            select(Series.season, Series.series, Series.video_file_id, Series.captions)
+            .where(Series.code == series_code)
+            .order_by(Series.season, Series.series)
+        )
+        result = await self.session.execute(stmt)
+        return [tuple(row) for row in result.all()]
+
     async def delete_series(self, series_code: int):
         stmt = delete(Series).where(Series.code == series_code)
         await self.session.execute(stmt)
@@ -142,13 +153,13 @@ class SeriesActions:
         await self.session.execute(stmt)
         await self.session.commit()
 
-    async def update_genres(self, series_code: int, genres: str) -> None:
+    async def update_genres(self, series_code: int, genres: list[str]) -> None:
         """Update genres for all episodes of a series code."""
         stmt = update(Series).where(Series.code == series_code).values(genres=genres)
         await self.session.execute(stmt)
         await self.session.commit()
 
-    async def get_genres_by_code(self, series_code: int) -> str | None:
+    async def get_genres_by_code(self, series_code: int) -> list[str] | None:
         """Get genres for a series code (from first available episode)."""
         stmt = select(Series.genres).where(Series.code == series_code).limit(1)
         result = await self.session.execute(stmt)
@@ -218,3 +229,26 @@ class SeriesActions:
         )
         await self.session.execute(stmt)
         await self.session.commit()
+
+    async def bulk_increment_views(self, counts: dict[tuple[int, int, int], int]):
+        """Apply accumulated view counts keyed by (code, season, series) in one statement."""
+        if not counts:
+            return
+        codes, seasons, series_nums = zip(*counts)
+        deltas = func.unnest(
+            bindparam("codes", list(codes), type_=ARRAY(BigInteger)),
+            bindparam("seasons", list(seasons), type_=ARRAY(BigInteger)),
+            bindparam("series_nums", list(series_nums), type_=ARRAY(BigInteger)),
+            bindparam("deltas", list(counts.values()), type_=ARRAY(BigInteger)),
+        ).table_valued("code", "season", "series", "delta")
+        stmt = (
+            update(Series)
+            .where(
+                Series.code == deltas.c.code,
+                Series.season == deltas.c.season,
+                Series.series == deltas.c.series,
+            )
+            .values(views_count=Series.views_count + deltas.c.delta)
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
@@ -1,9 +1,10 @@
-from datetime import datetime, timedelta
-from sqlalchemy import select, func, literal, union_all, or_
+from datetime import date, datetime, timedelta
+from sqlalchemy import select, func, literal, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
-from src.app.database.models import FeatureFilm, Series, MiniSeries, Favorite
+from src.app.database.models import FeatureFilm, Series, MiniSeries, Favorite, ViewBucket
+from src.app.database.queries.movie.view_buckets import ViewBucketActions
 
 logger = logging.getLogger(__name__)
 
@@ -15,9 +16,12 @@ class TopMoviesActions:
         self.session = session
     
     async def get_top_movies(self, interval: str = "total", limit: int = 20) -> list[dict]:
-        # ... (rest of existing method)
         """Top filmlarni olish - database darajasida agregatsiya
-        
+
+        Umumiy reytingda `views_count` ishlatiladi; day/week/month uchun ko'rishlar
+        `view_buckets` soatlik jadvalidan interval bo'yicha yig'iladi. Ko'rishlar va
+        saqlanganlar alohida agregatsiya qilinib, kod bo'yicha LEFT JOIN qilinadi.
+
         Args:
             interval: 'day' | 'week' | 'month' | 'total'
             limit: Nechta film qaytarish
@@ -26,73 +30,66 @@ class TopMoviesActions:
             List of dicts with movie info and stats
         """
         try:
-            # Interval uchun filter
             start_date = self._get_start_date(interval)
-            
-            # Feature Films query
-            feature_query = (
+
+            # Har bir kod uchun bitta qator: nom va tur
+            titles = union_all(
                 select(
                     FeatureFilm.code.label("code"),
                     FeatureFilm.name.label("name"),
                     literal("Film").label("type"),
-                    func.coalesce(func.count(func.distinct(Favorite.user_id)), 0).label("favs"),
-                    FeatureFilm.views_count.label("views"),
-                    (func.coalesce(func.count(func.distinct(Favorite.user_id)), 0) * 10 + FeatureFilm.views_count).label("score")
-                )
-                .outerjoin(Favorite, FeatureFilm.code == Favorite.movie_code)
-            )
-            
-            if start_date:
-                feature_query = feature_query.where(Favorite.created_at >= start_date)
-            
-            feature_query = feature_query.group_by(FeatureFilm.code, FeatureFilm.name, FeatureFilm.views_count)
-            
-            # Series query - group by code
-            series_query = (
+                    FeatureFilm.views_count.label("total_views"),
+                ),
                 select(
                     Series.code.label("code"),
                     func.max(Series.name).label("name"),
                     literal("Serial").label("type"),
-                    func.coalesce(func.count(func.distinct(Favorite.user_id)), 0).label("favs"),
-                    func.sum(Series.views_count).label("views"),
-                    (func.coalesce(func.count(func.distinct(Favorite.user_id)), 0) * 10 + func.sum(Series.views_count)).label("score")
-                )
-                .outerjoin(Favorite, Series.code == Favorite.movie_code)
-            )
-            
-            if start_date:
-                series_query = series_query.where(Favorite.created_at >= start_date)
-            
-            series_query = series_query.group_by(Series.code)
-            
-            # MiniSeries query - group by code
-            mini_query = (
+                    func.sum(Series.views_count).label("total_views"),
+                ).group_by(Series.code),
                 select(
                     MiniSeries.code.label("code"),
                     func.max(MiniSeries.name).label("name"),
                     literal("Epizodli film").label("type"),
-                    func.coalesce(func.count(func.distinct(Favorite.user_id)), 0).label("favs"),
-                    func.sum(MiniSeries.views_count).label("views"),
-                    (func.coalesce(func.count(func.distinct(Favorite.user_id)), 0) * 10 + func.sum(MiniSeries.views_count)).label("score")
-                )
-                .outerjoin(Favorite, MiniSeries.code == Favorite.movie_code)
-            )
-            
+                    func.sum(MiniSeries.views_count).label("total_views"),
+                ).group_by(MiniSeries.code),
+            ).subquery()
+
+            favs_query = select(Favorite.movie_code.label("code"), func.count().label("favs"))
             if start_date:
-                mini_query = mini_query.where(Favorite.created_at >= start_date)
-            
-            mini_query = mini_query.group_by(MiniSeries.code)
-            
-            # UNION ALL - barcha turlarni birlashtirish
-            combined_query = union_all(feature_query, series_query, mini_query).subquery()
-            
-            # Final query - sorting va limit
+                favs_query = favs_query.where(Favorite.created_at >= start_date)
+            favs = favs_query.group_by(Favorite.movie_code).subquery()
+
+            if start_date:
+                interval_views = (
+                    select(ViewBucket.movie_code.label("code"), func.sum(ViewBucket.views).label("views"))
+                    .where(ViewBucket.bucket >= ViewBucketActions.bucket_for(start_date))
+                    .group_by(ViewBucket.movie_code)
+                    .subquery()
+                )
+                views = func.coalesce(interval_views.c.views, 0)
+            else:
+                interval_views = None
+                views = func.coalesce(titles.c.total_views, 0)
+
+            fav_count = func.coalesce(favs.c.favs, 0)
+            score = (fav_count * 10 + views).label("score")
+
             final_query = (
-                select(combined_query)
-                .order_by(combined_query.c.score.desc())
-                .limit(limit)
+                select(
+                    titles.c.code,
+                    titles.c.name,
+                    titles.c.type,
+                    fav_count.label("favs"),
+                    views.label("views"),
+                    score,
+                )
+                .outerjoin(favs, favs.c.code == titles.c.code)
             )
-            
+            if interval_views is not None:
+                final_query = final_query.outerjoin(interval_views, interval_views.c.code == titles.c.code)
+
+            final_query = final_query.order_by(score.desc()).limit(limit)
+
             result = await self.session.execute(final_query)
             rows = result.all()
             
@@ -117,6 +114,8 @@ class TopMoviesActions:
     async def get_top_by_genres(self, genres: list[str], limit: int = 10) -> list[dict]:
         """Janrlar bo'yicha top filmlarni olish
         
+        `genres && :selected` (GIN indeks) bilan filtrlanadi; saqlanganlar alohida agregatsiya qilinadi.
+
         Args:
             genres: Tanlangan janrlar ro'yxati
             limit: Natijalar soni
@@ -127,64 +126,58 @@ class TopMoviesActions:
         try:
             if not genres:
                 return []
-            
-            # LIKE operatori uchun filterlarni tayyorlash
-            # JSON array ichidan qidirish: %"JanrName"%
-            genre_filters = [f'%"{g}"%' for g in genres]
-            
-            # Feature Films query
-            feature_query = (
+
+            titles = union_all(
                 select(
                     FeatureFilm.code.label("code"),
                     FeatureFilm.name.label("name"),
                     literal("Film").label("type"),
                     FeatureFilm.genres.label("genres"),
-                    func.coalesce(func.count(func.distinct(Favorite.user_id)), 0).label("favs"),
                     FeatureFilm.views_count.label("views"),
-                    (func.coalesce(func.count(func.distinct(Favorite.user_id)), 0) * 10 + FeatureFilm.views_count).label("score")
                 )
-                .outerjoin(Favorite, FeatureFilm.code == Favorite.movie_code)
-                .where(or_(*[FeatureFilm.genres.like(f) for f in genre_filters]))
-                .group_by(FeatureFilm.code, FeatureFilm.name, FeatureFilm.views_count, FeatureFilm.genres)
-            )
-            
-            # Series query
-            series_query = (
+                .where(FeatureFilm.genres.overlap(genres)),
                 select(
                     Series.code.label("code"),
                     func.max(Series.name).label("name"),
                     literal("Serial").label("type"),
-                    Series.genres.label("genres"),
-                    func.coalesce(func.count(func.distinct(Favorite.user_id)), 0).label("favs"),
+                    func.max(Series.genres).label("genres"),
                     func.sum(Series.views_count).label("views"),
-                    (func.coalesce(func.count(func.distinct(Favorite.user_id)), 0) * 10 + func.sum(Series.views_count)).label("score")
                 )
-                .outerjoin(Favorite, Series.code == Favorite.movie_code)
-                .where(or_(*[Series.genres.like(f) for f in genre_filters]))
-                .group_by(Series.code, Series.genres)
-            )
-            
-            # MiniSeries query
-            mini_query = (
+                .where(Series.genres.overlap(genres))
+                .group_by(Series.code),
                 select(
                     MiniSeries.code.label("code"),
                     func.max(MiniSeries.name).label("name"),
                     literal("Epizodli film").label("type"),
-                    MiniSeries.genres.label("genres"),
-                    func.coalesce(func.count(func.distinct(Favorite.user_id)), 0).label("favs"),
+                    func.max(MiniSeries.genres).label("genres"),
                     func.sum(MiniSeries.views_count).label("views"),
-                    (func.coalesce(func.count(func.distinct(Favorite.user_id)), 0) * 10 + func.sum(MiniSeries.views_count)).label("score")
                 )
-                .outerjoin(Favorite, MiniSeries.code == Favorite.movie_code)
-                .where(or_(*[MiniSeries.genres.like(f) for f in genre_filters]))
-                .group_by(MiniSeries.code, MiniSeries.genres)
+                .where(MiniSeries.genres.overlap(genres))
+                .group_by(MiniSeries.code),
+            ).subquery()
+
+            favs = (
+                select(Favorite.movie_code.label("code"), func.count().label("favs"))
+                .group_by(Favorite.movie_code)
+                .subquery()
             )
-            
-            combined_query = union_all(feature_query, series_query, mini_query).subquery()
-            
+
+            fav_count = func.coalesce(favs.c.favs, 0)
+            views = func.coalesce(titles.c.views, 0)
+            score = (fav_count * 10 + views).label("score")
+
             final_query = (
-                select(combined_query)
-                .order_by(combined_query.c.score.desc())
+                select(
+                    titles.c.code,
+                    titles.c.name,
+                    titles.c.type,
+                    titles.c.genres,
+                    fav_count.label("favs"),
+                    views.label("views"),
+                    score,
+                )
+                .outerjoin(favs, favs.c.code == titles.c.code)
+                .order_by(score.desc())
                 .limit(limit)
             )
             
@@ -209,20 +202,53 @@ class TopMoviesActions:
             logger.error(f"Error getting top by genres: {e}")
             return []
 
+    async def get_leaderboard_totals(self) -> list[tuple[int, int, int]]:
+        """Leaderboard'ni boshlang'ich to'ldirish uchun (code, views, favs)
+
+        Ko'rishlar va saqlanganlar alohida agregatsiya qilinadi - JOIN qatorlarni ko'paytirmaydi.
+        """
+        views_union = union_all(
+            select(FeatureFilm.code.label("code"), FeatureFilm.views_count.label("views")),
+            select(Series.code.label("code"), func.sum(Series.views_count).label("views")).group_by(Series.code),
+            select(MiniSeries.code.label("code"), func.sum(MiniSeries.views_count).label("views")).group_by(MiniSeries.code),
+        ).subquery()
+
+        favs = (
+            select(Favorite.movie_code.label("code"), func.count().label("favs"))
+            .group_by(Favorite.movie_code)
+            .subquery()
+        )
+
+        stmt = (
+            select(
+                views_union.c.code,
+                views_union.c.views,
+                func.coalesce(favs.c.favs, 0).label("favs"),
+            )
+            .outerjoin(favs, favs.c.code == views_union.c.code)
+        )
+        result = await self.session.execute(stmt)
+        return [(row.code, int(row.views or 0), int(row.favs)) for row in result.all()]
+
+    async def get_favorite_counts_by_day(self, since: datetime) -> list[tuple[datetime, int, int]]:
+        """(kun, code, saqlanganlar soni) - `since` dan boshlab"""
+        day = func.date_trunc("day", Favorite.created_at).label("day")
+        stmt = (
+            select(day, Favorite.movie_code, func.count().label("favs"))
+            .where(Favorite.created_at >= since)
+            .group_by(day, Favorite.movie_code)
+        )
+        result = await self.session.execute(stmt)
+        return [(row.day, row.movie_code, row.favs) for row in result.all()]
+
+    # Interval - bugun bilan birga oxirgi N kalendar kun (Redis leaderboard kunlik kalitlari bilan bir xil)
+    INTERVAL_DAYS = {"day": 1, "week": 7, "month": 30, "year": 365}
+
     def _get_start_date(self, interval: str) -> datetime | None:
-        """Interval uchun start date hisoblash"""
-        if interval == "total":
+        """Interval uchun start date hisoblash - N-1 kun oldingi yarim tun"""
+        days = self.INTERVAL_DAYS.get(interval)
+        if days is None:
             return None
-        
-        now = datetime.now()
-        
-        if interval == "day":
-            return now - timedelta(days=1)
-        elif interval == "week":
-            return now - timedelta(days=7)
-        elif interval == "month":
-            return now - timedelta(days=30)
-        elif interval == "year":
-            return now - timedelta(days=365)
-        
-        return None
+
+        today = datetime.combine(date.today(), datetime.min.time())
+        return today - timedelta(days=days - 1)
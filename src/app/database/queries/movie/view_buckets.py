@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.database.models import ViewBucket
+
+
+class ViewBucketActions:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @staticmethod
+    def bucket_for(moment: datetime) -> datetime:
+        """Hour bucket a moment belongs to."""
+        return moment.replace(minute=0, second=0, microsecond=0)
+
+    async def add_views(self, bucket: datetime, counts: dict[int, int]):
+        """Upsert per-title view counts for one hourly bucket in a single statement."""
+        if not counts:
+            return
+        stmt = insert(ViewBucket).values(
+            [{"bucket": bucket, "movie_code": code, "views": views} for code, views in counts.items()]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["bucket", "movie_code"],
+            set_={"views": ViewBucket.views + stmt.excluded.views},
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
+
+    async def get_view_counts_by_day(self, since: datetime) -> list[tuple[datetime, int, int]]:
+        day = func.date_trunc("day", ViewBucket.bucket).label("day")
+        stmt = (
+            select(day, ViewBucket.movie_code, func.sum(ViewBucket.views).label("views"))
+            .where(ViewBucket.bucket >= since)
+            .group_by(day, ViewBucket.movie_code)
+        )
+        result = await self.session.execute(stmt)
+        return [(row.day, row.movie_code, int(row.views)) for row in result.all()]
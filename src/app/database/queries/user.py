@@ -1,9 +1,14 @@
-from typing import AsyncGenerator
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator
 
-from sqlalchemy import select, update, func
+from sqlalchemy import JSON, select, update, func, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.database.models import User
+from src.app.database.models import User, RegistrationCounter
+
+# Статусы, которые рассылка пропускает ("limited" — временное ограничение, не входит)
+UNREACHABLE_STATUSES = ("blocked", "deleted", "deactivated")
 
 
 class UserActions:
@@ -20,7 +25,22 @@ class UserActions:
             is_premium=is_premium
         )
         self.session.add(user)
+        # Same transaction as the user insert - a duplicate user rolls the counter back too
+        counter = insert(RegistrationCounter).values(
+            day=func.current_date(),
+            language_code=language_code or "unknown",
+            registrations=1,
+            premium=int(bool(is_premium)),
+        )
+        counter = counter.on_conflict_do_update(
+            index_elements=["day", "language_code"],
+            set_={
+                "registrations": RegistrationCounter.registrations + 1,
+                "premium": RegistrationCounter.premium + counter.excluded.premium,
+            },
+        )
         try:
+            await self.session.execute(counter)
             await self.session.commit()
         except Exception:
             await self.session.rollback()
@@ -36,50 +56,111 @@ class UserActions:
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def get_created_cutoff(self, lag: timedelta) -> datetime:
+        """DB clock minus `lag`, in the same (naive) form as users.created_at"""
+        return await self.session.scalar(select(func.localtimestamp() - lag))
+
+    async def stream_user_ids(
+        self,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        batch_size: int = 10000
+    ) -> AsyncIterator[tuple[int, datetime]]:
+        """Yield (tg_id, created_at) through a server-side cursor, optionally within a created_at window
+
+        Rows come in no particular order - the window bounds need no sort,
+        and a full export would otherwise sort the whole table.
+        """
+        stmt = select(User.tg_id, User.created_at)
+        if created_after is not None:
+            stmt = stmt.where(User.created_at > created_after)
+        if created_before is not None:
+            stmt = stmt.where(User.created_at <= created_before)
+        result = await self.session.stream(stmt.execution_options(yield_per=batch_size))
+        async for tg_id, created_at in result:
+            yield tg_id, created_at
+
     async def get_registration_stats(self):
-        from datetime import datetime, timedelta
+        """All registration stats in one pass over users (count(*) FILTER + json_agg of top languages)"""
         now = datetime.now()
         day_ago = now - timedelta(days=1)
         week_ago = now - timedelta(days=7)
         month_ago = now - timedelta(days=30)
         year_ago = now - timedelta(days=365)
 
-        # Total
-        stmt_total = select(func.count(User.tg_id))
-        total = (await self.session.execute(stmt_total)).scalar()
-
-        # Day
-        stmt_day = select(func.count(User.tg_id)).where(User.created_at >= day_ago)
-        day = (await self.session.execute(stmt_day)).scalar()
-
-        # Month
-        stmt_month = select(func.count(User.tg_id)).where(User.created_at >= month_ago)
-        month = (await self.session.execute(stmt_month)).scalar()
-
-        # Week
-        stmt_week = select(func.count(User.tg_id)).where(User.created_at >= week_ago)
-        week = (await self.session.execute(stmt_week)).scalar()
-
-        # Year
-        stmt_year = select(func.count(User.tg_id)).where(User.created_at >= year_ago)
-        year = (await self.session.execute(stmt_year)).scalar()
-        
-        # New Stats: Premium & Language
-        stmt_premium = select(func.count(User.tg_id)).where(User.is_premium == True)
-        premium_count = (await self.session.execute(stmt_premium)).scalar()
-        
-        stmt_langs = select(User.language_code, func.count(User.tg_id)).group_by(User.language_code).order_by(func.count(User.tg_id).desc()).limit(5)
+        langs = (
+            select(
+                func.coalesce(User.language_code, "unknown").label("code"),
+                func.count().label("count"),
+            )
+            .group_by(User.language_code)
+            .order_by(func.count().desc())
+            .limit(5)
+            .subquery()
+        )
+        langs_json = select(
+            func.json_agg(
+                aggregate_order_by(func.json_build_object(literal_column("'code'"), langs.c.code, literal_column("'count'"), langs.c.count), langs.c.count.desc()),
+                type_=JSON,
+            )
+        ).scalar_subquery()
+
+        stmt = select(
+            func.count().label("total"),
+            func.count().filter(User.created_at >= day_ago).label("day"),
+            func.count().filter(User.created_at >= week_ago).label("week"),
+            func.count().filter(User.created_at >= month_ago).label("month"),
+            func.count().filter(User.created_at >= year_ago).label("year"),
+            func.count().filter(User.is_premium.is_(True)).label("premium"),
+            langs_json.label("languages"),
+        ).select_from(User)
+        row = (await self.session.execute(stmt)).one()
+
+        return {
+            "total": row.total,
+            "day": row.day,
+            "week": row.week,
+            "month": row.month,
+            "year": row.year,
+            "premium": row.premium,
+            "languages": row.languages or []
+        }
+
+    async def get_registration_stats_from_counters(self):
+        """
+        Same shape as get_registration_stats, read from registration_counters
+
+        Cost depends on the number of (day, language) rows, not on users.
+        Windows are whole calendar days ("day" = yesterday and today).
+        """
+        today = date.today()
+        c = RegistrationCounter
+        stmt = select(
+            func.coalesce(func.sum(c.registrations), 0).label("total"),
+            func.coalesce(func.sum(c.registrations).filter(c.day >= today - timedelta(days=1)), 0).label("day"),
+            func.coalesce(func.sum(c.registrations).filter(c.day >= today - timedelta(days=7)), 0).label("week"),
+            func.coalesce(func.sum(c.registrations).filter(c.day >= today - timedelta(days=30)), 0).label("month"),
+            func.coalesce(func.sum(c.registrations).filter(c.day >= today - timedelta(days=365)), 0).label("year"),
+            func.coalesce(func.sum(c.premium), 0).label("premium"),
+        )
+        row = (await self.session.execute(stmt)).one()
+
+        stmt_langs = (
+            select(c.language_code, func.sum(c.registrations))
+            .group_by(c.language_code)
+            .order_by(func.sum(c.registrations).desc())
+            .limit(5)
+        )
         langs_result = (await self.session.execute(stmt_langs)).all()
-        langs_stats = [{"code": row[0] or "unknown", "count": row[1]} for row in langs_result]
 
         return {
-            "total": total,
-            "day": day,
-            "week": week,
-            "month": month,
-            "year": year,
-            "premium": premium_count,
-            "languages": langs_stats
+            "total": int(row.total),
+            "day": int(row.day),
+            "week": int(row.week),
+            "month": int(row.month),
+            "year": int(row.year),
+            "premium": int(row.premium),
+            "languages": [{"code": code, "count": int(count)} for code, count in langs_result]
         }
 
     async def update_user_status(self, new_status: str, tg_id: int):
@@ -87,23 +168,32 @@ class UserActions:
         await self.session.execute(stmt)
         await self.session.commit()
 
-    async def get_user_ids_batch(self, offset: int, limit: int = 5000) -> list[int]:
-        stmt = select(User.tg_id).order_by(User.tg_id).offset(offset).limit(limit)
+    async def reactivate_user(self, tg_id: int) -> None:
+        """Unmark a blocked/deleted/deactivated user who came back via /start"""
+        stmt = (
+            update(User)
+            .where(User.tg_id == tg_id, User.status.in_(UNREACHABLE_STATUSES))
+            .values(status="unblocked")
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
+
+    async def get_user_ids_batch(self, after_id: int | None, limit: int = 5000) -> list[int]:
+        """Next page of reachable user ids after `after_id` (keyset pagination on the PK)"""
+        stmt = (
+            select(User.tg_id)
+            .where(User.status.not_in(UNREACHABLE_STATUSES))
+            .order_by(User.tg_id)
+            .limit(limit)
+        )
+        if after_id is not None:
+            stmt = stmt.where(User.tg_id > after_id)
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
-    async def iterate_user_ids(
-        self,
-        batch_size: int = 5000
-    ) -> AsyncGenerator[tuple[list[int], int], None]:
-
-        offset = 0
-
-        while True:
-            user_ids = await self.get_user_ids_batch(offset, batch_size)
-
-            if not user_ids:
-                break
-
-            yield user_ids, offset
-            offset += len(user_ids)
+    async def count_reachable_users(self, after_id: int | None = None) -> int:
+        """Number of users a broadcast would still send to after `after_id`"""
+        stmt = select(func.count(User.tg_id)).where(User.status.not_in(UNREACHABLE_STATUSES))
+        if after_id is not None:
+            stmt = stmt.where(User.tg_id > after_id)
+        return (await self.session.execute(stmt)).scalar()
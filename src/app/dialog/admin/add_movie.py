@@ -12,9 +12,11 @@ from aiogram_dialog.widgets.text import Const, Format, Case, Multi
 from aiogram_dialog.widgets.input import MessageInput
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.app.core.config import Settings
 from src.app.database.queries.movie.feature_films import FeatureFilmsActions
 from src.app.database.queries.movie.series import SeriesActions
 from src.app.database.queries.movie.mini_series import MiniSeriesActions
+from src.app.services.catalog_sync import sync_titles
 from src.app.states.admin.dialogs import AddMovieWizardSG, AdminMenuSG
 from src.app.common.genres import serialize_genres, deserialize_genres, get_genre_display_text
 
@@ -235,6 +237,7 @@ async def on_genre_toggle(c: CallbackQuery, widget: Any, manager: DialogManager,
 
 async def on_confirm(c: CallbackQuery, widget: Any, manager: DialogManager):
     session: AsyncSession = manager.middleware_data["session"]
+    settings: Settings = manager.middleware_data["settings"]
     data = manager.dialog_data
     m_type = data.get("movie_type")
 
@@ -267,6 +270,7 @@ async def on_confirm(c: CallbackQuery, widget: Any, manager: DialogManager):
                 genres=serialize_genres(data.get("genres", []))
             )
 
+        await sync_titles(session, settings.redis_url, data["code"])
         await c.message.answer("✅ Успешно сохранено!")
         await manager.switch_to(AddMovieWizardSG.success)
     except Exception as e:
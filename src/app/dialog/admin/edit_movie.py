@@ -11,9 +11,11 @@ from aiogram_dialog.widgets.media import DynamicMedia
 from aiogram_dialog.widgets.text import Const, Format, Case, Multi
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.app.core.config import Settings
 from src.app.database.queries.movie.feature_films import FeatureFilmsActions
 from src.app.database.queries.movie.series import SeriesActions
 from src.app.database.queries.movie.mini_series import MiniSeriesActions
+from src.app.services.catalog_sync import sync_titles
 from src.app.states.admin.dialogs import EditMovieSG, AdminMenuSG
 from src.app.common.genres import GENRES, serialize_genres, deserialize_genres, get_genre_display_text
 
@@ -47,6 +49,7 @@ async def on_genre_toggle(c: CallbackQuery, widget: Any, manager: DialogManager,
     """Handle genre toggle in edit mode."""
     if widget.widget_id == "save_genres":
         session: AsyncSession = manager.middleware_data["session"]
+        settings: Settings = manager.middleware_data["settings"]
         code = manager.dialog_data["code"]
         m_type = manager.dialog_data["type"]
         genres_list = manager.dialog_data.get("genres", [])
@@ -58,7 +61,8 @@ async def on_genre_toggle(c: CallbackQuery, widget: Any, manager: DialogManager,
             await SeriesActions(session).update_genres(code, genres_ser)
         elif m_type == "mini_series":
             await MiniSeriesActions(session).update_genres(code, genres_ser)
-            
+        await sync_titles(session, settings.redis_url, code)
+
         # Update local cache so summary reflects changes immediately
         if "obj" in manager.dialog_data:
             manager.dialog_data["obj"]["genres"] = genres_ser
@@ -151,6 +155,7 @@ async def on_set_return_details(c: CallbackQuery, widget: Any, manager: DialogMa
 
 async def on_edit_name(m: Message, widget: Any, manager: DialogManager):
     session: AsyncSession = manager.middleware_data["session"]
+    settings: Settings = manager.middleware_data["settings"]
     code = manager.dialog_data["code"]
     m_type = manager.dialog_data["type"]
     new_name = m.text
@@ -165,12 +170,14 @@ async def on_edit_name(m: Message, widget: Any, manager: DialogManager):
             elif m_type == "mini_series":
                 n = int(ep_id)
                 await MiniSeriesActions(session).update_episode_metadata(code, n, name=new_name)
+            await sync_titles(session, settings.redis_url, code)
             await m.answer("✅ Название серии обновлено!")
             await manager.switch_to(EditMovieSG.edit_episode_details)
         else:
             # Feature Film update
             if m_type == "feature_film":
                 await FeatureFilmsActions(session).update_feature_film(code, name=new_name)
+                await sync_titles(session, settings.redis_url, code)
                 manager.dialog_data["obj"]["name"] = new_name
                 await m.answer("✅ Название обновлено!")
                 await manager.switch_to(EditMovieSG.select_action)
@@ -180,6 +187,7 @@ async def on_edit_name(m: Message, widget: Any, manager: DialogManager):
 
 async def on_edit_caption(m: Message, widget: Any, manager: DialogManager):
     session: AsyncSession = manager.middleware_data["session"]
+    settings: Settings = manager.middleware_data["settings"]
     code = manager.dialog_data["code"]
     m_type = manager.dialog_data["type"]
     new_caption = m.html_text if m.caption else m.text
@@ -194,12 +202,14 @@ async def on_edit_caption(m: Message, widget: Any, manager: DialogManager):
             elif m_type == "mini_series":
                 n = int(ep_id)
                 await MiniSeriesActions(session).update_episode_metadata(code, n, captions=new_caption)
+            await sync_titles(session, settings.redis_url, code)
             await m.answer("✅ Описание серии обновлено!")
             await manager.switch_to(EditMovieSG.edit_episode_details)
         else:
             # Feature Film update
             if m_type == "feature_film":
                 await FeatureFilmsActions(session).update_feature_film(code, captions=new_caption)
+                await sync_titles(session, settings.redis_url, code)
                 manager.dialog_data["obj"]["caption"] = new_caption
                 await m.answer("✅ Описание обновлено!")
                 await manager.switch_to(EditMovieSG.select_action)
@@ -216,6 +226,7 @@ async def on_edit_code(m: Message, widget: Any, manager: DialogManager):
     old_code = manager.dialog_data["code"]
     m_type = manager.dialog_data["type"]
     session: AsyncSession = manager.middleware_data["session"]
+    settings: Settings = manager.middleware_data["settings"]
     ep_id = manager.dialog_data.get("selected_episode_id")
 
     try:
@@ -227,6 +238,7 @@ async def on_edit_code(m: Message, widget: Any, manager: DialogManager):
             elif m_type == "mini_series":
                 n = int(ep_id)
                 await MiniSeriesActions(session).move_to_feature_film(old_code, n, new_code)
+            await sync_titles(session, settings.redis_url, old_code, new_code)
 
             await m.answer(f"✅ Серия отделена и теперь является фильмом с кодом {new_code}!")
             # After separation, we go back to main search or somewhere logical
@@ -239,6 +251,7 @@ async def on_edit_code(m: Message, widget: Any, manager: DialogManager):
                 await SeriesActions(session).update_movie_code(old_code, new_code)
             elif m_type == "mini_series":
                 await MiniSeriesActions(session).update_movie_code(old_code, new_code)
+            await sync_titles(session, settings.redis_url, old_code, new_code)
 
             await m.answer(f"✅ Код успешно изменен!")
             manager.dialog_data["code"] = new_code
@@ -257,6 +270,7 @@ async def on_edit_file(m: Message, widget: Any, manager: DialogManager):
         return
 
     session: AsyncSession = manager.middleware_data["session"]
+    settings: Settings = manager.middleware_data["settings"]
     code = manager.dialog_data["code"]
     m_type = manager.dialog_data["type"]
     ep_id = manager.dialog_data.get("selected_episode_id")
@@ -269,11 +283,13 @@ async def on_edit_file(m: Message, widget: Any, manager: DialogManager):
             elif m_type == "mini_series":
                 num = int(ep_id)
                 await MiniSeriesActions(session).update_episode_file(code, num, file_id)
+            await sync_titles(session, settings.redis_url, code)
             await m.answer("✅ Файл серии обновлен!")
             await manager.switch_to(EditMovieSG.edit_episode_details)
         else:
             if m_type == "feature_film":
                 await FeatureFilmsActions(session).update_feature_film(code, video_file_id=file_id)
+                await sync_titles(session, settings.redis_url, code)
                 manager.dialog_data["obj"]["file_id"] = file_id
             await m.answer("✅ Видео обновлено!")
             await manager.switch_to(EditMovieSG.select_action)
@@ -298,6 +314,7 @@ async def on_edit_episode_num(m: Message, widget: Any, manager: DialogManager):
 
     new_num = int(m.text)
     session: AsyncSession = manager.middleware_data["session"]
+    settings: Settings = manager.middleware_data["settings"]
     code = manager.dialog_data["code"]
     m_type = manager.dialog_data["type"]
     ep_id = manager.dialog_data["selected_episode_id"]
@@ -319,6 +336,7 @@ async def on_edit_episode_num(m: Message, widget: Any, manager: DialogManager):
                 return
             await MiniSeriesActions(session).update_episode_details(code, old_num, series=new_num)
             manager.dialog_data["selected_episode_id"] = str(new_num)
+        await sync_titles(session, settings.redis_url, code)
 
         await m.answer("✅ Номер серии обновлен!")
         await manager.switch_to(EditMovieSG.edit_episode_details)
@@ -333,6 +351,7 @@ async def on_edit_season_num(m: Message, widget: Any, manager: DialogManager):
 
     new_season = int(m.text)
     session: AsyncSession = manager.middleware_data["session"]
+    settings: Settings = manager.middleware_data["settings"]
     code = manager.dialog_data["code"]
 
     try:
@@ -346,6 +365,7 @@ async def on_edit_season_num(m: Message, widget: Any, manager: DialogManager):
                 return
             await SeriesActions(session).update_episode_details(code, season, num, season=new_season)
             manager.dialog_data["selected_episode_id"] = f"{new_season}:{num}"
+            await sync_titles(session, settings.redis_url, code)
             await m.answer("✅ Номер сезона для этой серии обновлен!")
             await manager.switch_to(EditMovieSG.edit_episode_details)
         else:  # Global season rename
@@ -356,6 +376,7 @@ async def on_edit_season_num(m: Message, widget: Any, manager: DialogManager):
                 return
             await SeriesActions(session).update_global_season_selective(code, old_season, new_season)
             manager.dialog_data["selected_season"] = new_season
+            await sync_titles(session, settings.redis_url, code)
             await m.answer(f"✅ Сезон {old_season} переименован в {new_season}!")
             await manager.switch_to(EditMovieSG.select_episode)
     except Exception as e:
@@ -364,6 +385,7 @@ async def on_edit_season_num(m: Message, widget: Any, manager: DialogManager):
 
 async def on_delete_confirm(c: CallbackQuery, widget: Any, manager: DialogManager):
     session: AsyncSession = manager.middleware_data["session"]
+    settings: Settings = manager.middleware_data["settings"]
     code = manager.dialog_data["code"]
     m_type = manager.dialog_data["type"]
     try:
@@ -373,6 +395,7 @@ async def on_delete_confirm(c: CallbackQuery, widget: Any, manager: DialogManage
             await MiniSeriesActions(session).delete_mini_series(code)
         elif m_type == "series":
             await SeriesActions(session).delete_series(code)
+        await sync_titles(session, settings.redis_url, code)
         await c.message.answer("✅ Успешно удалено.")
         await manager.switch_to(EditMovieSG.input_code)
     except Exception as e:
@@ -381,6 +404,7 @@ async def on_delete_confirm(c: CallbackQuery, widget: Any, manager: DialogManage
 
 async def on_delete_episode_confirm(c: CallbackQuery, widget: Any, manager: DialogManager):
     session: AsyncSession = manager.middleware_data["session"]
+    settings: Settings = manager.middleware_data["settings"]
     code = manager.dialog_data["code"]
     m_type = manager.dialog_data["type"]
     selected_ep_id = manager.dialog_data.get("selected_episode_id")
@@ -391,6 +415,7 @@ async def on_delete_episode_confirm(c: CallbackQuery, widget: Any, manager: Dial
         elif m_type == "mini_series":
             n = int(selected_ep_id)
             await MiniSeriesActions(session).delete_mini_series_for_series(code, n)
+        await sync_titles(session, settings.redis_url, code)
         await c.message.answer("✅ Серия успешно удалена.")
         await manager.switch_to(EditMovieSG.select_episode)
     except Exception as e:
@@ -399,10 +424,12 @@ async def on_delete_episode_confirm(c: CallbackQuery, widget: Any, manager: Dial
 
 async def on_delete_season_confirm(c: CallbackQuery, widget: Any, manager: DialogManager):
     session: AsyncSession = manager.middleware_data["session"]
+    settings: Settings = manager.middleware_data["settings"]
     code = manager.dialog_data["code"]
     season = manager.dialog_data["selected_season"]
     try:
         await SeriesActions(session).delete_season(code, season)
+        await sync_titles(session, settings.redis_url, code)
         await c.message.answer(f"✅ Сезон {season} успешно удален.")
         await manager.switch_to(EditMovieSG.select_season)
     except Exception as e:
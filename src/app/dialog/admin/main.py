@@ -1,4 +1,3 @@
-from aiogram import Bot
 import html
 from aiogram.enums import ContentType
 from aiogram.types import Message, CallbackQuery
@@ -8,11 +7,14 @@ from aiogram_dialog.widgets.kbd import Button, Row, Start, SwitchTo, Cancel
 from aiogram_dialog.widgets.text import Const, Format
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.app.core.config import Settings
 from src.app.states.admin.dialogs import AdminMenuSG, AddMovieWizardSG, EditMovieSG, BackupSG
 from src.app.states.admin.referral import ReferralSG
 from src.app.states.admin.channel import OPMenu
+from src.app.database.queries.broadcast_jobs import BroadcastJobActions
 from src.app.database.queries.user import UserActions
-from src.app.services.broadcaster import Broadcaster
+from src.app.services.broadcaster import wake_broadcast_worker
+from src.app.services.cache_service import CacheService
 
 
 
@@ -31,10 +33,22 @@ def get_flag_emoji(lang_code: str) -> str:
     return flags.get(code, "🏳️")
 
 
+STATS_CACHE_KEY = "stats:registrations"
+STATS_CACHE_TTL = 60
+
+
 async def get_statistics(dialog_manager: DialogManager, **kwargs):
     session: AsyncSession = dialog_manager.middleware_data["session"]
-    user_actions = UserActions(session)
-    stats = await user_actions.get_registration_stats()
+    settings: Settings = dialog_manager.middleware_data["settings"]
+
+    stats = await CacheService.get_cached(settings.redis_url, STATS_CACHE_KEY)
+    if stats is None:
+        user_actions = UserActions(session)
+        if settings.stats_from_counters:
+            stats = await user_actions.get_registration_stats_from_counters()
+        else:
+            stats = await user_actions.get_registration_stats()
+        await CacheService.set_cached(settings.redis_url, STATS_CACHE_KEY, stats, ttl=STATS_CACHE_TTL)
     
     # Format languages
     langs_str = "\n".join([f"   • {get_flag_emoji(l['code'])}: {l['count']}" for l in stats["languages"]])
@@ -58,7 +72,6 @@ async def on_broadcast_message(m: Message, widget, manager: DialogManager):
 
 async def on_broadcast_confirm(c: CallbackQuery, widget, manager: DialogManager):
     session: AsyncSession = manager.middleware_data["session"]
-    bot: Bot = manager.middleware_data["bot"]
     broadcast_message = manager.dialog_data.get("broadcast_message")
     
     if not broadcast_message:
@@ -66,20 +79,59 @@ async def on_broadcast_confirm(c: CallbackQuery, widget, manager: DialogManager)
         return
     
     try:
-        broadcaster = Broadcaster(
-            bot=bot,
-            session=session,
+        # Рассылку выполняет фоновый воркер - задача переживает перезапуск бота
+        job = await BroadcastJobActions(session).create_job(
             admin_id=c.from_user.id,
-            broadcasting_message=broadcast_message
+            from_chat_id=broadcast_message.chat.id,
+            message_ids=[broadcast_message.message_id],
+            reply_markup=(
+                broadcast_message.reply_markup.model_dump_json(exclude_none=True)
+                if broadcast_message.reply_markup else None
+            ),
         )
-        await c.message.answer("🚀 Рассылка началась...")
-        await broadcaster.broadcast()
-        await c.message.answer("✅ Рассылка завершена!")
-        await manager.switch_to(AdminMenuSG.menu)
+        wake_broadcast_worker()
+        await c.message.answer(f"🚀 Рассылка #{job.job_id} поставлена в очередь")
+        await manager.switch_to(AdminMenuSG.broadcast_status)
     except Exception as e:
         await c.message.answer(f"❌ Ошибка: {html.escape(str(e))}")
 
 
+BROADCAST_STATUS_LABELS = {
+    "pending": "⏳ В очереди",
+    "running": "🚀 Выполняется",
+    "done": "✅ Завершена",
+    "failed": "❌ Ошибка",
+}
+
+
+async def get_broadcast_status(dialog_manager: DialogManager, **kwargs):
+    session: AsyncSession = dialog_manager.middleware_data["session"]
+    job = await BroadcastJobActions(session).get_latest_job()
+
+    if not job:
+        return {"has_job": False, "no_job": True}
+
+    remaining = 0
+    if job.status in ("pending", "running"):
+        remaining = await UserActions(session).count_reachable_users(job.last_user_id)
+
+    return {
+        "has_job": True,
+        "no_job": False,
+        "job_id": job.job_id,
+        "status": BROADCAST_STATUS_LABELS.get(job.status, job.status),
+        "sent": job.sent,
+        "failed": job.failed,
+        "blocked": job.blocked,
+        "deleted": job.deleted,
+        "limited": job.limited,
+        "deactivated": job.deactivated,
+        "remaining": remaining,
+        "updated_at": job.updated_at.strftime("%d.%m.%Y %H:%M:%S"),
+        "error": html.escape(job.error or ""),
+    }
+
+
 admin_main_dialog = Dialog(
     Window(
         Const("👨‍💻 <b>Админ Панель</b>\n\nВыберите раздел:"),
@@ -91,6 +143,9 @@ admin_main_dialog = Dialog(
             Start(Const("📢 Каналы и Боты"), id="channels_bots", state=OPMenu.menu),
             SwitchTo(Const("📨 Рассылка"), id="broadcast", state=AdminMenuSG.broadcast_input),
         ),
+        Row(
+            SwitchTo(Const("📈 Статус рассылки"), id="broadcast_status", state=AdminMenuSG.broadcast_status),
+        ),
         Row(
             Start(Const("🔗 Рефералы"), id="referrals", state=ReferralSG.menu),
         ),
@@ -129,4 +184,25 @@ admin_main_dialog = Dialog(
         SwitchTo(Const("❌ Отмена"), id="cancel_confirm", state=AdminMenuSG.menu),
         state=AdminMenuSG.broadcast_confirm,
     ),
+    Window(
+        Format(
+            "📈 <b>Рассылка #{job_id}</b>\n\n"
+            "Статус: {status}\n"
+            "Отправлено: {sent}\n"
+            "Не удалось отправить: {failed}\n"
+            "Заблокировали: {blocked}\n"
+            "Удаленных аккаунтов: {deleted}\n"
+            "Ограниченных: {limited}\n"
+            "Деактивированных: {deactivated}\n"
+            "Осталось: {remaining}\n\n"
+            "🕒 Обновлено: {updated_at}",
+            when="has_job",
+        ),
+        Format("⚠️ {error}", when="error"),
+        Const("📈 Рассылок ещё не было", when="no_job"),
+        SwitchTo(Const("🔄 Обновить"), id="refresh_broadcast_status", state=AdminMenuSG.broadcast_status),
+        SwitchTo(Const("⬅️ Назад"), id="back_from_broadcast_status", state=AdminMenuSG.menu),
+        state=AdminMenuSG.broadcast_status,
+        getter=get_broadcast_status,
+    ),
 )
@@ -17,11 +17,25 @@ from aiogram_dialog import DialogManager
 
 from src.app.database.queries.bots import BotActions
 from src.app.database.queries.channels import ChannelActions
+from src.app.services.op_config import OPConfigStore
 from src.app.states.admin.channel import OPMenu, ChannelMenu, AddChannelState, AddBotState, BotMenu
 
 logger = logging.getLogger(__name__)
 
 
+async def reload_op_config(dialog_manager: DialogManager) -> None:
+    """
+    Rebuild the OP config snapshot after a change and notify other workers.
+
+    Args:
+        dialog_manager: Current dialog state manager
+    """
+    await OPConfigStore.reload_and_publish(
+        dialog_manager.middleware_data["session"],
+        dialog_manager.middleware_data["settings"].redis_url,
+    )
+
+
 # ==================== CHANNEL HANDLERS ====================
 
 async def handle_channel_forward(
@@ -120,6 +134,7 @@ async def handle_channel_url_input(
             f"✅ Channel added successfully: {channel_data['channel_name']} "
             f"({channel_data['channel_id']}) - {channel_url}"
         )
+        await reload_op_config(dialog_manager)
 
     except IntegrityError:
         logger.warning(f"Channel {channel_data['channel_id']} already exists (unique violation)")
@@ -183,6 +198,7 @@ async def handle_delete_channel(
     try:
         await channel_actions.delete_channel(channel_id)
         logger.info(f"✅ Channel {channel_id} deleted successfully")
+        await reload_op_config(manager)
     except Exception as e:
         logger.error(f"❌ Error deleting channel {channel_id}: {e}", exc_info=True)
 
@@ -226,6 +242,7 @@ async def handle_toggle_channel_op_status(
         logger.info(
             f"✅ Channel {channel_id} status changed: {current_status} -> {new_status}"
         )
+        await reload_op_config(manager)
 
     except Exception as e:
         logger.error(f"❌ Error toggling channel {channel_id} status: {e}", exc_info=True)
@@ -372,6 +389,7 @@ async def handle_bot_name_input(
             bot_url=bot_url
         )
         logger.info(f"✅ Bot added successfully: {bot_name} (@{bot_username}) - {bot_url}")
+        await reload_op_config(dialog_manager)
 
     except IntegrityError:
         logger.warning(f"Bot @{bot_username} already exists (unique violation)")
@@ -431,6 +449,7 @@ async def handle_delete_bot(
     try:
         await bot_actions.delete_bot(bot_username)
         logger.info(f"✅ Bot @{bot_username} deleted successfully")
+        await reload_op_config(manager)
     except Exception as e:
         logger.error(f"❌ Error deleting bot @{bot_username}: {e}", exc_info=True)
 
@@ -474,6 +493,7 @@ async def handle_toggle_bot_op_status(
         logger.info(
             f"✅ Bot @{bot_username} status changed: {current_status} -> {new_status}"
         )
+        await reload_op_config(manager)
 
     except Exception as e:
         logger.error(f"❌ Error toggling bot @{bot_username} status: {e}", exc_info=True)
@@ -3,10 +3,11 @@ from aiogram.types import CallbackQuery
 from aiogram_dialog import DialogManager
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.database.queries.bots import BotActions
-from src.app.database.queries.channels import ChannelActions
+from src.app.core.config import Settings
 from src.app.database.queries.user import UserActions
 from src.app.keyboards.inline import not_channels_button, start_menu
+from src.app.services.op_config import OPConfigStore
+from src.app.services.subscription_cache import get_not_subscribed_channels
 
 check_sub_router = Router()
 
@@ -17,43 +18,17 @@ async def check_channel_sub(
         dialog_manager: DialogManager,
         session: AsyncSession,
         bot: Bot,
+        settings: Settings,
 ):
-    channel_actions = ChannelActions(session)
-    bot_actions = BotActions(session)
     user_actions = UserActions(session)
 
     user_data = await user_actions.get_user(call.from_user.id)
-    channel_data = await channel_actions.get_all_channels()
-    bot_data = await bot_actions.get_all_bots()
-    not_sub_channels = []
-    not_sub_bots = []
+    op_config = await OPConfigStore.get(session)
+    # Telegram API boshqa botga /start bosilganini tekshirishga imkon bermaydi - faol botlar ko'rsatiladi
+    not_sub_bots = list(op_config.active_bots)
 
     # Проверка подписки на обязательные каналы
-    for channel in channel_data:
-        # channel_status
-        if channel.channel_status == "True" or channel.channel_status is True:
-            try:
-                user_status = await bot.get_chat_member(channel.channel_id, call.from_user.id)
-                if user_status.status not in ["member", "administrator", "creator"]:
-                    not_sub_channels.append(channel)
-            except Exception as e:
-                # Если канал не найден или возникла ошибка
-                # print(f"Ошибка при проверке канала {channel.channel_id}: {e}")
-                continue
-
-    for bot_obj in bot_data:
-        # bot_status
-        if bot_obj.bot_status == "True" or bot_obj.bot_status is True:
-            try:
-               # Logic to check bot sub? Usually bots are just sending /start.
-               # Original code just added to not_sub_bots list to show button?
-               # The logic in original 'check_sub' for bots iterates bot_data, checks status, appends to not_sub_bots.
-               # It doesn't seem to verify if user started the bot (Telegram API doesn't allow checking if user started another bot easily).
-               # So maybe it just lists them?
-               not_sub_bots.append(bot_obj)
-            except Exception as e:
-                # print(f"Ошибка при проверке канала {bot_obj.bot_username}: {e}")
-                continue
+    not_sub_channels = await get_not_subscribed_channels(bot, settings.redis_url, op_config.active_channels, call.from_user.id, force=True)
 
     # Если пользователь подписан на все каналы
     if not not_sub_channels:
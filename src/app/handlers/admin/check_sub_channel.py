@@ -1,11 +1,13 @@
 from aiogram import Router, Bot, F
-from aiogram.types import Message, CallbackQuery
+from aiogram.types import Message, CallbackQuery, ChatMemberUpdated
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.database.queries.channels import ChannelActions
+from src.app.core.config import Settings
 from src.app.filters.check_channel_sub import CheckSubscription
 from src.app.keyboards.inline import not_channels_button
 from src.app.keyboards.replay import random_movies
+from src.app.services.op_config import OPConfigStore
+from src.app.services.subscription_cache import SubscriptionCache, SUBSCRIBED_STATUSES, get_not_subscribed_channels
 
 # Router for the "Check Subscription" button (Handles click regardless of status)
 sub_check_button_router = Router()
@@ -17,21 +19,8 @@ check_channel_sub_router.callback_query.filter(CheckSubscription())
 
 
 @check_channel_sub_router.message()
-async def check_channel_sub_message(message: Message, session: AsyncSession, bot: Bot):
-    channel_actions = ChannelActions(session)
-    channel_data = await channel_actions.get_all_channels()
-
-    not_sub_channels = []
-    # Filter only mandatory channels
-    for channel in channel_data:
-        if channel.channel_status == "True":
-            try:
-                user_status = await bot.get_chat_member(channel.channel_id, message.from_user.id)
-                if user_status.status not in ["member", "administrator", "creator"]:
-                    not_sub_channels.append(channel)
-            except Exception as e:
-                print(f"Error checking channel {channel.channel_id}: {e}")
-
+async def check_channel_sub_message(message: Message, not_sub_channels: list):
+    # not_sub_channels - CheckSubscription filtri hisoblagan natija
     await message.answer(
         "Botdan foydalanish uchun ushbu kanallarga obuna bo'ling 👇",
         reply_markup=not_channels_button(not_sub_channels, [])
@@ -39,26 +28,14 @@ async def check_channel_sub_message(message: Message, session: AsyncSession, bot
 
 
 @check_channel_sub_router.callback_query()
-async def check_channel_sub_barrier_callback(call: CallbackQuery, session: AsyncSession, bot: Bot):
+async def check_channel_sub_barrier_callback(call: CallbackQuery, not_sub_channels: list):
     """
     Intercepts generic callbacks if user is NOT subscribed.
     Does NOT handle 'check_sub' because that is handled by sub_check_button_router.
     """
     # If we are here, CheckSubscription is True (user not subscribed)
     # AND it wasn't caught by sub_check_button_router (which should be registered first)
-    
-    channel_actions = ChannelActions(session)
-    channel_data = await channel_actions.get_all_channels()
-    
-    not_sub_channels = []
-    for channel in channel_data:
-         if channel.channel_status == "True":
-            try:
-                user_status = await bot.get_chat_member(channel.channel_id, call.from_user.id)
-                if user_status.status not in ["member", "administrator", "creator"]:
-                    not_sub_channels.append(channel)
-            except Exception as e:
-                pass
+    # not_sub_channels comes from the filter, no need to check again
 
     await call.message.answer(
         "Botdan foydalanish uchun ushbu kanallarga obuna bo'ling 👇",
@@ -68,19 +45,10 @@ async def check_channel_sub_barrier_callback(call: CallbackQuery, session: Async
 
 
 @sub_check_button_router.callback_query(F.data == "check_sub")
-async def on_check_subscription_button(call: CallbackQuery, session: AsyncSession, bot: Bot):
-    channel_actions = ChannelActions(session)
-    channel_data = await channel_actions.get_all_channels()
-    
-    not_sub_channels = []
-    for channel in channel_data:
-         if channel.channel_status == "True":
-            try:
-                user_status = await bot.get_chat_member(channel.channel_id, call.from_user.id)
-                if user_status.status not in ["member", "administrator", "creator"]:
-                    not_sub_channels.append(channel)
-            except Exception as e:
-                print(f"Error checking channel {channel.channel_id}: {e}")
+async def on_check_subscription_button(call: CallbackQuery, session: AsyncSession, bot: Bot, settings: Settings):
+    channel_data = (await OPConfigStore.get(session)).active_channels
+
+    not_sub_channels = await get_not_subscribed_channels(bot, settings.redis_url, channel_data, call.from_user.id, force=True)
 
     if not_sub_channels:
         # User is still not subscribed
@@ -109,3 +77,14 @@ async def on_check_subscription_button(call: CallbackQuery, session: AsyncSessio
             f"<b>🍿 Kino kodini yuboring:</b>",
             reply_markup=random_movies
         )
+
+
+@sub_check_button_router.chat_member()
+async def on_channel_member_update(update: ChatMemberUpdated, settings: Settings):
+    """Kanalga qo'shilish/chiqish - obuna keshini darhol yangilash"""
+    await SubscriptionCache.set_status(
+        settings.redis_url,
+        update.chat.id,
+        update.new_chat_member.user.id,
+        update.new_chat_member.status in SUBSCRIBED_STATUSES,
+    )
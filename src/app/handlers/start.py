@@ -3,7 +3,7 @@ from aiogram.filters import CommandStart
 from aiogram.types import Message
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.database.queries.user import UserActions
+from src.app.database.queries.user import UserActions, UNREACHABLE_STATUSES
 from src.app.database.queries.referral import ReferralActions
 from src.app.keyboards.replay import random_movies
 
@@ -36,6 +36,10 @@ async def start_bot(message: Message, command: CommandStart, session: AsyncSessi
             except (ValueError, IndexError):
                 pass
 
+    # Пользователь ранее помечен как заблокировавший/удалённый вернулся — снова включаем в рассылку
+    elif user_data.status in UNREACHABLE_STATUSES:
+        await user_actions.reactivate_user(message.from_user.id)
+
     # Определение имени пользователя
     name = (
         message.from_user.first_name
@@ -1,62 +1,81 @@
 import html
-from aiogram import Router
+from aiogram import Router, F
 from aiogram.filters import Command
-from aiogram.types import Message
+from aiogram.types import Message, CallbackQuery
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.database.queries.movie.favorite_movies import FavoriteMoviesActions
-from src.app.database.queries.movie.feature_films import FeatureFilmsActions
-from src.app.database.queries.movie.mini_series import MiniSeriesActions
-from src.app.database.queries.movie.series import SeriesActions
+from src.app.keyboards.callback_data import FavoritesPageCD
+from src.app.keyboards.inline import favorites_pagination_kbd
 
 logger = logging.getLogger(__name__)
 favorite_movies_router = Router()
 
+FAVORITES_PAGE_SIZE = 20
+FAVORITE_KIND_EMOJI = {"feature_film": "🎬", "series": "📺", "mini_series": "🧩"}
+
+
+async def render_favorites_page(session: AsyncSession, user_id: int, page: int):
+    """Bitta sahifa matni va klaviaturasi - bitta so'rov bilan"""
+    favorites_actions = FavoriteMoviesActions(session)
+    titles, total = await favorites_actions.get_favorite_titles_page(
+        user_id, offset=page * FAVORITES_PAGE_SIZE, limit=FAVORITES_PAGE_SIZE
+    )
+    if not total:
+        return None, None
+
+    pages = (total + FAVORITES_PAGE_SIZE - 1) // FAVORITES_PAGE_SIZE
+    if not titles:
+        # Sahifa o'chirishlar tufayli bo'shab qolgan - oxirgisini ko'rsatamiz
+        return await render_favorites_page(session, user_id, pages - 1)
+
+    texts = "📬 <b>Sizning filmlar to'plamingiz</b>\n"
+    texts += "━━━━━━━━━━━━━━━━━━━━━\n\n"
+
+    for code, name, kind in titles:
+        texts += f"{FAVORITE_KIND_EMOJI[kind]} <b>{html.escape(name)}</b>\n"
+        texts += f"└ 🆔 Kod: <code>{code}</code>\n\n"
+
+    texts += "━━━━━━━━━━━━━━━━━━━━━\n"
+    texts += "<i>Filmni ko'rish uchun uning kodini botga yuboring.</i>"
+
+    return texts, favorites_pagination_kbd(page, pages)
+
+
 @favorite_movies_router.message(Command("favorites"))
 async def list_favorite_movies(message: Message, session: AsyncSession):
     try:
-        favorites_actions = FavoriteMoviesActions(session)
-        favorite_films_data = await favorites_actions.get_all_favorites_by_user_id(user_id=message.from_user.id)
+        texts, keyboard = await render_favorites_page(session, message.from_user.id, 0)
 
-        if not favorite_films_data:
+        if texts is None:
             await message.answer("😔 <b>Siz hali hech nima saqlamagansiz</b>", parse_mode="HTML")
             return
 
-        texts = "📬 <b>Sizning filmlar to'plamingiz</b>\n"
-        texts += "━━━━━━━━━━━━━━━━━━━━━\n\n"
-        
-        feature_movies_actions = FeatureFilmsActions(session)
-        mini_series_actions = MiniSeriesActions(session)
-        series_actions = SeriesActions(session)
-
-        for favorite_film_data in favorite_films_data:
-            movie_code = favorite_film_data.movie_code
+        await message.answer(texts, parse_mode="HTML", reply_markup=keyboard)
 
-            # Try to find the movie in any table
-            feature = await feature_movies_actions.get_feature_film(movie_code)
-            if feature:
-                texts += f"🎬 <b>{html.escape(feature.name)}</b>\n"
-                texts += f"└ 🆔 Kod: <code>{movie_code}</code>\n\n"
-                continue
+    except Exception as e:
+        logger.error(f"Error in list_favorite_movies: {e}")
+        await message.answer("❌ Xatolik yuz berdi. Iltimos, qaytadan urinib ko'ring.")
 
-            mini = await mini_series_actions.get_mini_series(movie_code)
-            if mini:
-                texts += f"🧩 <b>{html.escape(mini[0].name)}</b>\n"
-                texts += f"└ 🆔 Kod: <code>{movie_code}</code>\n\n"
-                continue
 
-            series = await series_actions.get_series(movie_code)
-            if series:
-                texts += f"📺 <b>{html.escape(series[0].name)}</b>\n"
-                texts += f"└ 🆔 Kod: <code>{movie_code}</code>\n\n"
-                continue
+@favorite_movies_router.callback_query(FavoritesPageCD.filter())
+async def favorites_page(call: CallbackQuery, callback_data: FavoritesPageCD, session: AsyncSession):
+    try:
+        texts, keyboard = await render_favorites_page(session, call.from_user.id, max(callback_data.page, 0))
 
-        texts += "━━━━━━━━━━━━━━━━━━━━━\n"
-        texts += "<i>Filmni ko'rish uchun uning kodini botga yuboring.</i>"
+        if texts is None:
+            await call.message.edit_text("😔 <b>Siz hali hech nima saqlamagansiz</b>", parse_mode="HTML")
+            return
 
-        await message.answer(texts, parse_mode="HTML")
+        await call.message.edit_text(texts, parse_mode="HTML", reply_markup=keyboard)
+        await call.answer()
 
     except Exception as e:
-        logger.error(f"Error in list_favorite_movies: {e}")
-        await message.answer("❌ Xatolik yuz berdi. Iltimos, qaytadan urinib ko'ring.")
+        logger.error(f"Error in favorites_page: {e}")
+        await call.answer("❌ Xatolik yuz berdi", show_alert=True)
+
+
+@favorite_movies_router.callback_query(F.data == "favorites_page_info")
+async def favorites_page_info(call: CallbackQuery):
+    await call.answer()
@@ -7,7 +7,6 @@ import logging
 
 from src.app.core.config import Settings
 from src.app.database.models import FeatureFilm, MiniSeries, Series
-from src.app.database.queries.movie.favorite_movies import FavoriteMoviesActions
 from src.app.database.queries.movie.feature_films import FeatureFilmsActions
 from src.app.database.queries.movie.mini_series import MiniSeriesActions
 from src.app.database.queries.movie.series import SeriesActions
@@ -15,6 +14,11 @@ from src.app.database.queries.movie.top_movies import TopMoviesActions
 from src.app.keyboards.inline import film_kbd, mini_series_player_kbd, series_player_kbd, instagram_channel_kbd
 from src.app.common.genres import GENRES, get_genre_display_text, deserialize_genres
 from src.app.repositories.repository import SearchRepository
+from src.app.services.favorites_cache import FavoritesCache
+from src.app.services.genre_engine import GenreEngine
+from src.app.services.leaderboard import Leaderboard, TITLE_KIND_LABEL
+from src.app.services.search_index import TitleSearchIndex
+from src.app.services.title_cache import TitleCache
 from src.app.services.view_tracker import ViewTracker
 from src.app.states.user.dialogs import SearchByGenreSG
 from src.app.keyboards.replay import random_movies
@@ -23,8 +27,10 @@ logger = logging.getLogger(__name__)
 
 movie_search_router = Router()
 
+TITLE_KIND_EMOJI = {"feature_film": "🎬", "series": "📺", "mini_series": "🧩"}
+
 @movie_search_router.message(F.text.in_(["🎬 Tasodifiy Film", "📺 Tasodifiy Serial", "🍿 Tasodifiy Epizodli Film"]))
-async def random_film_handler(message: Message, session: AsyncSession):
+async def random_film_handler(message: Message, session: AsyncSession, settings: Settings):
     feature_films_actions = FeatureFilmsActions(session)
     mini_series_actions = MiniSeriesActions(session)
     series_actions = SeriesActions(session)
@@ -45,9 +51,8 @@ async def random_film_handler(message: Message, session: AsyncSession):
         await message.answer("😔 Hozircha bu turdagi kontent mavjud emas.")
         return
 
-    favorite_actions = FavoriteMoviesActions(session)
     # Check if saved. random_movie.code is common for all.
-    saved = bool(await favorite_actions.get_favorites(random_movie.code, message.from_user.id))
+    saved = await FavoritesCache.is_saved(session, settings.redis_url, message.from_user.id, random_movie.code)
 
     if isinstance(random_movie, FeatureFilm):
         await message.answer_video(
@@ -57,9 +62,10 @@ async def random_film_handler(message: Message, session: AsyncSession):
         )
         # TRACK VIEW - Random
         await track_and_increment_view(
+            redis_url=settings.redis_url,
             user_id=message.from_user.id,
             movie_code=random_movie.code,
-            increment_func=lambda: feature_films_actions.increment_views(random_movie.code)
+            movie_type="feature"
         )
     elif isinstance(random_movie, MiniSeries):
         ms_all = await mini_series_actions.get_mini_series(random_movie.code)
@@ -70,9 +76,11 @@ async def random_film_handler(message: Message, session: AsyncSession):
         )
         # TRACK VIEW - Random
         await track_and_increment_view(
+            redis_url=settings.redis_url,
             user_id=message.from_user.id,
             movie_code=random_movie.code,
-            increment_func=lambda: mini_series_actions.increment_views(random_movie.code, random_movie.series)
+            movie_type="mini_series",
+            series=random_movie.series
         )
     elif isinstance(random_movie, Series):
         s_all = await series_actions.get_series(random_movie.code)
@@ -100,21 +108,25 @@ async def random_film_handler(message: Message, session: AsyncSession):
         )
         # TRACK VIEW - Random
         await track_and_increment_view(
+            redis_url=settings.redis_url,
             user_id=message.from_user.id,
             movie_code=random_movie.code,
-            increment_func=lambda: series_actions.increment_views(random_movie.code, random_movie.season, random_movie.series)
+            movie_type="series",
+            season=random_movie.season,
+            series=random_movie.series
         )
 
 @movie_search_router.message(F.text == "🔝 Top Filmlar")
-async def top_films_handler(message: Message, session: AsyncSession):
-    await send_top_movies(message, session, interval="total")
+async def top_films_handler(message: Message, session: AsyncSession, settings: Settings):
+    await send_top_movies(message, session, settings.redis_url, interval="total")
 
-async def send_top_movies(message: Message, session: AsyncSession, interval: str = "total"):
-    """Top filmlarni ko'rsatish - optimallashtirilgan versiya"""
+async def send_top_movies(message: Message, session: AsyncSession, redis_url: str, interval: str = "total"):
+    """Top filmlarni ko'rsatish - Redis'dagi tayyor reytingdan, bo'lmasa DB'dan"""
     try:
-        # Optimallashtirilgan query - database darajasida agregatsiya
-        top_movies_actions = TopMoviesActions(session)
-        top_20 = await top_movies_actions.get_top_movies(interval=interval, limit=20)
+        top_20 = await Leaderboard.get_top(redis_url, interval=interval, limit=20)
+        if top_20 is None:
+            top_movies_actions = TopMoviesActions(session)
+            top_20 = await top_movies_actions.get_top_movies(interval=interval, limit=20)
     except Exception as e:
         logger.error(f"Error getting top movies: {e}")
         await message.answer("❌ Xatolik yuz berdi. Iltimos, qaytadan urinib ko'ring.")
@@ -194,7 +206,7 @@ async def genre_search_back(message: Message, state: FSMContext):
     await message.answer("🏠 Asosiy menyu", reply_markup=random_movies)
 
 @movie_search_router.message(SearchByGenreSG.select_genres, F.text == "🔍 Qidirish")
-async def genre_search_execute(message: Message, state: FSMContext, session: AsyncSession):
+async def genre_search_execute(message: Message, state: FSMContext, session: AsyncSession, settings: Settings):
     data = await state.get_data()
     selected = data.get("selected_genres", [])
     
@@ -202,8 +214,23 @@ async def genre_search_execute(message: Message, state: FSMContext, session: Asy
         await message.answer("⚠️ Kamida bitta janrni tanlang!")
         return
     
-    top_actions = TopMoviesActions(session)
-    results = await top_actions.get_top_by_genres(selected, limit=10)
+    if TitleSearchIndex.is_ready():
+        # Xotiradagi janr maskalari bo'yicha; ko'rish/saqlash soni Redis reytingidan
+        top = GenreEngine.top(selected, limit=10)
+        stats = await Leaderboard.get_stats(settings.redis_url, [entry.code for entry, _ in top])
+        results = [
+            {
+                "code": entry.code,
+                "name": entry.name,
+                "type": TITLE_KIND_LABEL[entry.kind],
+                "views": views,
+                "favs": favs,
+            }
+            for (entry, _), (views, favs) in zip(top, stats)
+        ]
+    else:
+        top_actions = TopMoviesActions(session)
+        results = await top_actions.get_top_by_genres(selected, limit=10)
     
     genre_header = get_genre_display_text(selected, lang="uz")
 
@@ -263,82 +290,70 @@ async def genre_search_toggle(message: Message, state: FSMContext):
 
 
 @movie_search_router.message(F.text & ~F.text.startswith("/"))
-async def movie_search_handler(message: Message, session: AsyncSession):
-    favorite_actions = FavoriteMoviesActions(session)
-    feature_films_actions = FeatureFilmsActions(session)
-    mini_series_actions = MiniSeriesActions(session)
-    series_actions = SeriesActions(session)
-
+async def movie_search_handler(message: Message, session: AsyncSession, settings: Settings):
     query = message.text.strip()
 
     # --- SEARCH BY CODE ---
     if query.isdigit():
         code = int(query)
-        
-        feature_films = await feature_films_actions.get_feature_film(code)
-        mini_series = await mini_series_actions.get_mini_series(code)
-        series = await series_actions.get_series(code)
 
-        saved = await favorite_actions.get_favorites(code, message.from_user.id)
-        saved = bool(saved)
+        # Keshdan yoki bitta so'rovda: qaysi turdagi kontent, birinchi qism va saqlanganmi
+        title = await TitleCache.resolve(session, settings.redis_url, code, message.from_user.id)
 
-        if feature_films:
+        if title and title.kind == "feature_film":
             await message.answer_video(
-                video=feature_films.video_file_id,
-                caption=feature_films.captions,
-                reply_markup=film_kbd(code, saved)
+                video=title.video_file_id,
+                caption=title.captions,
+                reply_markup=film_kbd(code, title.saved)
             )
             
             await track_and_increment_view(
+                redis_url=settings.redis_url,
                 user_id=message.from_user.id,
                 movie_code=code,
-                increment_func=lambda: feature_films_actions.increment_views(code)
+                movie_type="feature"
             )
             return
-        elif mini_series:
-            # mini_series is list[MiniSeries]
+        elif title and title.kind == "mini_series":
             await message.answer_video(
-                video=mini_series[0].video_file_id,
-                caption=mini_series[0].captions,
-                reply_markup=mini_series_player_kbd(code, 1, len(mini_series), saved)
+                video=title.video_file_id,
+                caption=title.captions,
+                reply_markup=mini_series_player_kbd(code, title.series, title.episodes_count, title.saved)
             )
 
             # TRACK VIEW - optimized
             await track_and_increment_view(
+                redis_url=settings.redis_url,
                 user_id=message.from_user.id,
                 movie_code=code,
-                increment_func=lambda: mini_series_actions.increment_views(code, 1)
+                movie_type="mini_series",
+                series=title.series
             )
             return
-        elif series:
-            current_season_series = 0
-            for s in series:
-                if s.season == 1:
-                    current_season_series += 1
-
-            first_ep = series[0]
-            last_ep = series[-1]
-            
+        elif title and title.kind == "series":
             await message.answer_video(
-                video=first_ep.video_file_id,
-                caption=first_ep.captions,
+                video=title.video_file_id,
+                caption=title.captions,
                 reply_markup=series_player_kbd(
                     code,
                     1, # current global series num
-                    len(series), # total series count
-                    first_ep.season, # current season
-                    last_ep.season, # total seasons count
-                    first_ep.series, # current series num in season
-                    current_season_series,
-                    saved
+                    title.episodes_count, # total series count
+                    title.season, # current season
+                    title.seasons_count, # total seasons count
+                    title.series, # current series num in season
+                    title.first_season_episodes_count,
+                    title.saved
                 )
             )
 
             # TRACK VIEW - optimized
             await track_and_increment_view(
+                redis_url=settings.redis_url,
                 user_id=message.from_user.id,
                 movie_code=code,
-                increment_func=lambda: series_actions.increment_views(code, first_ep.season, first_ep.series)
+                movie_type="series",
+                season=title.season,
+                series=title.series
             )
             return
         else:
@@ -349,23 +364,11 @@ async def movie_search_handler(message: Message, session: AsyncSession):
     search_engine = SearchRepository(session)
     results = []
 
-    for film, score in await search_engine.search_feature_films(message.text.lower()):
-        genres_text = get_genre_display_text(deserialize_genres(film.genres), lang="uz")
-        results.append(f"🎬 <b>{film.name}</b>\n"
-                       f"└ 🎭 Janr: <b>{genres_text}</b>\n"
-                       f"└ 🆔 Kod: <code>{film.code}</code>\n")
-
-    for series, score in await search_engine.search_series(message.text.lower()):
-        genres_text = get_genre_display_text(deserialize_genres(series.genres), lang="uz")
-        results.append(f"📺 <b>{series.name}</b>\n"
+    for entry, score in await search_engine.search_titles(query, fuzzy=True):
+        genres_text = get_genre_display_text(deserialize_genres(entry.genres), lang="uz")
+        results.append(f"{TITLE_KIND_EMOJI[entry.kind]} <b>{entry.name}</b>\n"
                        f"└ 🎭 Janr: <b>{genres_text}</b>\n"
-                       f"└ 🆔 Kod: <code>{series.code}</code>\n")
-
-    for mini, score in await search_engine.search_mini_series(message.text.lower()):
-        genres_text = get_genre_display_text(deserialize_genres(mini.genres), lang="uz")
-        results.append(f"🧩 <b>{mini.name}</b>\n"
-                       f"└ 🎭 Janr: <b>{genres_text}</b>\n"
-                       f"└ 🆔 Kod: <code>{mini.code}</code>\n")
+                       f"└ 🆔 Kod: <code>{entry.code}</code>\n")
 
     if not results:
         if query.isdigit():
@@ -395,15 +398,18 @@ async def movie_search_handler(message: Message, session: AsyncSession):
 
 
 async def track_and_increment_view(
+    redis_url: str,
     user_id: int,
     movie_code: int,
-    increment_func,
+    movie_type: str,
+    season: int = None,
+    series: int = None,
 ):
+    """Yangi ko'rishni Redis'dagi pending hisobga qo'shish (bitta round trip)
 
+    DB'ga yozish fon rejimida `pending_views_flusher` tomonidan batch qilib bajariladi.
+    """
     try:
-        settings = Settings()
-        if await ViewTracker.is_new_view(settings.redis_url, user_id, movie_code):
-            await increment_func()
+        await ViewTracker.record_view(redis_url, user_id, movie_code, movie_type, season, series)
     except Exception as e:
         logger.error(f"Error tracking view: {e}")
-
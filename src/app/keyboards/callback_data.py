@@ -20,6 +20,10 @@ class SeriesPlayerCD(CallbackData, prefix="series_player"):
     action: str
 
 
+class FavoritesPageCD(CallbackData, prefix="favorites_page"):
+    page: int
+
+
 class ActionType(str, enum.Enum):
     back_series = "back_series"
     next_series = "next_series"
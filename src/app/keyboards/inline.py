@@ -2,7 +2,7 @@ from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from src.app.keyboards.callback_data import SeriesPlayerCD, FeatureFilmPlayerCD, \
-    MiniSeriesPlayerCD, ActionType
+    MiniSeriesPlayerCD, ActionType, FavoritesPageCD
 
 
 def series_player_kbd(
@@ -230,6 +230,21 @@ def mini_series_player_kbd(code: int, current_seria: int, serias_count: int, sav
 
 
 
+def favorites_pagination_kbd(page: int, pages: int) -> InlineKeyboardMarkup | None:
+    if pages <= 1:
+        return None
+
+    inline_keyboard = InlineKeyboardBuilder()
+    buttons = []
+    if page > 0:
+        buttons.append(InlineKeyboardButton(text="⏮️ Orqaga", callback_data=FavoritesPageCD(page=page - 1).pack()))
+    buttons.append(InlineKeyboardButton(text=f"{page + 1}/{pages}", callback_data="favorites_page_info"))
+    if page < pages - 1:
+        buttons.append(InlineKeyboardButton(text="Keyingi ⏭️", callback_data=FavoritesPageCD(page=page + 1).pack()))
+
+    inline_keyboard.row(*buttons)
+    return inline_keyboard.as_markup()
+
 
 start_menu = InlineKeyboardMarkup(
     inline_keyboard=[
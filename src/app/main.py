@@ -16,14 +16,22 @@ from src.app.database.database_backup import daily_database_sender
 from src.app.database.database_dsn import construct_postgresql_url
 from src.app.core.config import Settings
 from src.app.database.core import Database, Base
+from src.app.database.migrations import run_migrations
 from src.app.handlers import register_all_routers
 from src.app.middleware import register_middleware
+from src.app.services.broadcaster import broadcast_worker
+from src.app.services.leaderboard import leaderboard_refresher
+from src.app.services.op_config import OPConfigStore
+from src.app.services.search_index import TitleSearchIndex
+from src.app.services.title_cache import TitleCache
+from src.app.services.view_flusher import pending_views_flusher
 
 
 async def main():
     settings = Settings()
 
-    dp = Dispatcher()
+    # settings barcha handler va dialoglarga workflow_data orqali uzatiladi
+    dp = Dispatcher(settings=settings)
 
     dsn = construct_postgresql_url(settings)
 
@@ -31,6 +39,11 @@ async def main():
 
     async with db.engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await run_migrations(conn)
+
+    async with db.session_factory() as session:
+        await TitleSearchIndex.build(session)
+        await OPConfigStore.reload(session)
 
     register_all_routers(dp, settings)
     setup_dialogs(dp)
@@ -39,11 +52,20 @@ async def main():
 
     bot = Bot(settings.bot_token, default=DefaultBotProperties(parse_mode="HTML"))
 
-    asyncio.create_task(daily_database_sender(bot, settings.admins_ids, db.session_factory))
+    asyncio.create_task(daily_database_sender(
+        bot, settings.admins_ids, db.session_factory, settings.redis_url, settings.daily_export_delta
+    ))
+    asyncio.create_task(pending_views_flusher(db.session_factory, settings.redis_url))
+    asyncio.create_task(leaderboard_refresher(db.session_factory, settings.redis_url))
+    asyncio.create_task(OPConfigStore.listen(db.session_factory, settings.redis_url))
+    asyncio.create_task(TitleCache.listen(settings.redis_url))
+    # Qayta ishga tushish sababli to'xtab qolgan rassilkani oxirgi checkpoint'dan davom ettiradi
+    asyncio.create_task(broadcast_worker(bot, db.session_factory))
 
     await create_bot_commands(bot, settings)
 
-    await dp.start_polling(bot)
+    # chat_member yangilanishlari faqat aniq so'ralganda keladi (obuna keshi uchun kerak)
+    await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
 
 
 if __name__ == "__main__":
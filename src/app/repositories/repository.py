@@ -3,6 +3,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.database.models import FeatureFilm, Series, MiniSeries
+from src.app.services.search_index import TitleEntry, TitleSearchIndex
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +14,32 @@ class SearchRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    async def search_titles(
+            self,
+            query: str,
+            limit: int | None = None,
+            fuzzy: bool = False,
+    ) -> list[tuple[TitleEntry, int]]:
+        """Barcha turlar bo'yicha bitta o'tishda qidirish
+
+        Xotiradagi trigram indeksdan foydalanadi; indeks hali qurilmagan
+        bo'lsa ILIKE so'rovlariga qaytadi (fuzzy rejim faqat indeks bilan ishlaydi).
+
+        Returns:
+            List of (entry, score) tuples
+        """
+        if TitleSearchIndex.is_ready():
+            return TitleSearchIndex.search(query, limit, fuzzy=fuzzy)
+
+        results = []
+        for film, score in await self.search_feature_films(query):
+            results.append((TitleEntry(film.code, film.name, "feature_film", tuple(film.genres or ())), score))
+        for series, score in await self.search_series(query):
+            results.append((TitleEntry(series.code, series.name, "series", tuple(series.genres or ())), score))
+        for mini, score in await self.search_mini_series(query):
+            results.append((TitleEntry(mini.code, mini.name, "mini_series", tuple(mini.genres or ())), score))
+        return results[:limit] if limit else results
+
     async def search_feature_films(self, query: str, limit: int = 20) -> list[tuple]:
         """Feature filmlarni qidirish
         
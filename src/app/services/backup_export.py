@@ -0,0 +1,205 @@
+import asyncio
+import datetime
+import gzip
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, asdict
+from typing import AsyncIterator
+
+import aiofiles
+
+logger = logging.getLogger(__name__)
+
+# Buffered writes: flush to disk once this many characters are accumulated
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Bot API upload limit is 50 MB; a part is closed before it reaches this size
+# (leaves room for the last buffered chunk and the gzip trailer)
+PART_SIZE_LIMIT = 45 * 1024 * 1024
+COMPRESS_LEVEL = 6
+
+
+def _json_default(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def to_ndjson_line(row: dict) -> str:
+    return json.dumps(row, ensure_ascii=False, default=_json_default) + "\n"
+
+
+@dataclass(slots=True)
+class BackupPart:
+    path: str
+    rows: int = 0
+    size: int = 0
+    sha256: str = ""
+
+
+class _HashingFile:
+    """Raw output file that tracks size and sha256 of the compressed stream"""
+
+    def __init__(self, path: str):
+        self._file = open(path, "wb")
+        self._sha = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data) -> int:
+        self._sha.update(data)
+        self.size += len(data)
+        return self._file.write(data)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> str:
+        self._file.close()
+        return self._sha.hexdigest()
+
+
+class _GzipPartWriter:
+    """Blocking part writer - every call runs in a worker thread"""
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self.parts: list[BackupPart] = []
+        self._raw: _HashingFile | None = None
+        self._gzip: gzip.GzipFile | None = None
+
+    def write(self, data: bytes, rows: int) -> None:
+        if self._gzip is None:
+            part = BackupPart(path=f"{self.prefix}.part{len(self.parts) + 1:03d}.ndjson.gz")
+            self.parts.append(part)
+            self._raw = _HashingFile(part.path)
+            self._gzip = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=COMPRESS_LEVEL)
+
+        self._gzip.write(data)
+        self.parts[-1].rows += rows
+        if self._raw.size >= PART_SIZE_LIMIT:
+            self.close_part()
+
+    def close_part(self) -> None:
+        if self._gzip is None:
+            return
+        self._gzip.close()
+        part = self.parts[-1]
+        part.sha256 = self._raw.close()
+        part.size = self._raw.size
+        self._gzip = self._raw = None
+
+
+async def write_gzip_parts(rows: AsyncIterator[dict], prefix: str) -> list[BackupPart]:
+    """
+    Stream rows into gzip-compressed NDJSON parts under the Bot API upload limit
+
+    Every part is a standalone .ndjson.gz (rows never span two parts).
+    Compression and file I/O run in a worker thread, one ~1 MB chunk at a time.
+
+    Returns:
+        Written parts with row counts, compressed size and sha256
+    """
+    writer = _GzipPartWriter(prefix)
+    buffer: list[str] = []
+    buffered = 0
+
+    try:
+        async for row in rows:
+            line = to_ndjson_line(row)
+            buffer.append(line)
+            buffered += len(line)
+
+            if buffered >= WRITE_BUFFER_SIZE:
+                await asyncio.to_thread(writer.write, "".join(buffer).encode("utf-8"), len(buffer))
+                buffer.clear()
+                buffered = 0
+
+        if buffer:
+            await asyncio.to_thread(writer.write, "".join(buffer).encode("utf-8"), len(buffer))
+    finally:
+        await asyncio.to_thread(writer.close_part)
+
+    logger.info(f"Exported {sum(p.rows for p in writer.parts)} rows to {len(writer.parts)} part(s) of {prefix}")
+    return writer.parts
+
+
+class _SplitWriter:
+    """Raw output that rolls over to a new part file every PART_SIZE_LIMIT bytes"""
+
+    def __init__(self, prefix: str, suffix: str):
+        self.prefix = prefix
+        self.suffix = suffix
+        self.parts: list[BackupPart] = []
+        self._raw: _HashingFile | None = None
+
+    def write(self, data) -> int:
+        view = memoryview(data)
+        while view:
+            if self._raw is None:
+                part = BackupPart(path=f"{self.prefix}.part{len(self.parts) + 1:03d}{self.suffix}")
+                self.parts.append(part)
+                self._raw = _HashingFile(part.path)
+
+            room = PART_SIZE_LIMIT - self._raw.size
+            self._raw.write(view[:room])
+            view = view[room:]
+            if self._raw.size >= PART_SIZE_LIMIT:
+                self.close()
+        return len(data)
+
+    def flush(self) -> None:
+        if self._raw is not None:
+            self._raw.flush()
+
+    def close(self) -> None:
+        if self._raw is None:
+            return
+        part = self.parts[-1]
+        part.sha256 = self._raw.close()
+        part.size = self._raw.size
+        self._raw = None
+
+
+def _gzip_file_parts(source: str, prefix: str) -> list[BackupPart]:
+    writer = _SplitWriter(prefix, ".gz")
+    try:
+        with open(source, "rb") as src, gzip.GzipFile(fileobj=writer, mode="wb", compresslevel=COMPRESS_LEVEL) as gz:
+            while chunk := src.read(WRITE_BUFFER_SIZE):
+                gz.write(chunk)
+    finally:
+        writer.close()
+    return writer.parts
+
+
+async def gzip_file_parts(source: str, prefix: str) -> list[BackupPart]:
+    """
+    Compress an existing file into one gzip stream split into upload-sized parts
+
+    Unlike `write_gzip_parts`, parts are byte slices of a single stream:
+    restore with `cat prefix.part*.gz | gunzip`. Runs in a worker thread.
+    """
+    return await asyncio.to_thread(_gzip_file_parts, source, prefix)
+
+
+async def write_manifest(
+        table: str,
+        parts: list[BackupPart],
+        path: str,
+        fmt: str = "ndjson+gzip",
+        total_rows: int | None = None,
+) -> dict:
+    """Manifest with per-part row counts and checksums, for verifying a restore"""
+    manifest = {
+        "table": table,
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "format": fmt,
+        "total_rows": sum(part.rows for part in parts) if total_rows is None else total_rows,
+        "parts": [
+            {**asdict(part), "path": part.path.rsplit("/", 1)[-1]}
+            for part in parts
+        ],
+    }
+    async with aiofiles.open(path, "w", encoding="utf-8") as f:
+        await f.write(json.dumps(manifest, ensure_ascii=False, indent=2))
+    return manifest
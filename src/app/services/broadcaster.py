@@ -1,21 +1,68 @@
+import html
 import asyncio
 import logging
-from typing import Union, Optional
+import time
+from datetime import timedelta
+from typing import Union
 
 from sqlalchemy import update
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from aiogram import Bot, types
 from aiogram.exceptions import TelegramForbiddenError, TelegramBadRequest, TelegramRetryAfter, TelegramAPIError
-from aiogram.types import (
-    Message, InputMediaPhoto, InputMediaVideo, InputMediaDocument, InputMediaAudio,
-    InputMediaAnimation
-)
+from aiogram.types import Message, InlineKeyboardMarkup
 
+from src.app.database.queries.broadcast_jobs import BroadcastJobActions
 from src.app.database.queries.user import UserActions
-from src.app.database.models import User
+from src.app.database.models import User, BroadcastJob
 
 logger = logging.getLogger(__name__)
 
+# Задача считается брошенной, если чекпоинт не обновлялся дольше этого времени
+JOB_LEASE = timedelta(minutes=2)
+BROADCAST_POLL_INTERVAL = 10
+
+_wakeup = asyncio.Event()
+
+
+class TokenBucket:
+    """
+    Global rate limiter shared by all sender workers
+
+    Tokens refill at `rate` per second up to `capacity`. `pause()` (on
+    TelegramRetryAfter) empties the bucket and blocks every worker until
+    the flood wait is over, instead of sleeping in a single coroutine.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait for one token"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Stop all sends for `seconds`"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0
+        self._updated = self._paused_until
+
 
 class Broadcaster:
 
@@ -23,67 +70,77 @@ class Broadcaster:
             self,
             bot: Bot,
             session: AsyncSession,
-            admin_id: int,
-            broadcasting_message: Message | None = None,
-            album: list[Message] | None = None,
+            job: BroadcastJob,
             batch_size: int = 5000,
-            sleep_seconds: float = 0.05  # Default: 20 messages per second (below API limit)
+            rate_limit: float = 30,  # Bot API limit for bulk messages
+            workers: int = 10,
+            status_update_interval: float = 5
     ):
         """
-        Initialize the broadcaster
+        Initialize the broadcaster for a persisted broadcast job
 
         Args:
             bot: Telegram Bot instance
-            admin_id: Admin user ID for status reports
-            broadcasting_message: Single message to broadcast
-            album: Media album to broadcast
-            sleep_seconds: Delay between messages to avoid rate limits
+            session: Database session owned by this run
+            job: Job record with the source message and checkpoint to resume from
+            rate_limit: Maximum messages per second across all workers
+            workers: Number of concurrent sender workers
+            status_update_interval: Seconds between checkpoints / status message edits
         """
         self._bot = bot
         self._session = session
-        self.broadcasting_message = broadcasting_message
-        self.album = album
-        self.admin_id = admin_id
+        self.job_id = job.job_id
+        self.admin_id = job.admin_id
+        self.from_chat_id = job.from_chat_id
+        self.message_ids = list(job.message_ids)
+        self.reply_markup = (
+            InlineKeyboardMarkup.model_validate_json(job.reply_markup) if job.reply_markup else None
+        )
         self.batch_size = batch_size
-        self.sleep_seconds = sleep_seconds
-        self.message_per_second = int(1 / self.sleep_seconds) if sleep_seconds > 0 else 25
-
-        # Статистика для отчетов
-        self.sent_messages_count = 0
-        self.failed_messages_count = 0
+        self.workers = workers
+        self.status_update_interval = status_update_interval
+        self._bucket = TokenBucket(rate_limit)
+        # Все записи в БД идут через одну сессию - heartbeat и обработка пачек не должны пересекаться
+        self._db_lock = asyncio.Lock()
+
+        # Статистика для отчетов (продолжается с чекпоинта)
+        self.sent_messages_count = job.sent
+        self.failed_messages_count = job.failed
         self.processed_batches = 0
         self.total_processed = 0
 
+        # Последний tg_id, до которого (включительно) все пользователи обработаны
+        self.last_user_id: int | None = job.last_user_id
+
         # Списки различных типов блокировок
         self.blocked_users: list[int] = []  # Пользователи, заблокировавшие бота
         self.deleted_users: list[int] = []  # Пользователи, чей аккаунт удален
         self.deactivated_users: list[int] = []  # Пользователи, чей аккаунт был деактивирован
         self.limited_users: list[int] = []  # Пользователи, чей аккаунт временно ограничен
 
-        self.total_blocked_users: int = 0  # Количество пользователей, заблокировавшие бота
-        self.total_deleted_users: int = 0  # Количество пользователей, чей аккаунт удален
-        self.total_deactivated_users: int = 0  # Количество пользователей, чей аккаунт был деактивирован
-        self.total_limited_users: int = 0  # Количество пользователей, чей аккаунт временно ограничен
+        self.total_blocked_users: int = job.blocked  # Количество пользователей, заблокировавшие бота
+        self.total_deleted_users: int = job.deleted  # Количество пользователей, чей аккаунт удален
+        self.total_deactivated_users: int = job.deactivated  # Количество пользователей, чей аккаунт был деактивирован
+        self.total_limited_users: int = job.limited  # Количество пользователей, чей аккаунт временно ограничен
 
-        # Validate input parameters
-        if not (broadcasting_message or album):
-            raise ValueError("Either broadcasting_message or album must be provided")
-        if broadcasting_message and album:
-            raise ValueError("Only one of broadcasting_message or album should be provided")
+        if not self.message_ids:
+            raise ValueError("Broadcast job has no messages")
+
+    def _counters(self) -> dict[str, int]:
+        return {
+            "sent": self.sent_messages_count,
+            "failed": self.failed_messages_count,
+            "blocked": self.total_blocked_users + len(self.blocked_users),
+            "deleted": self.total_deleted_users + len(self.deleted_users),
+            "limited": self.total_limited_users + len(self.limited_users),
+            "deactivated": self.total_deactivated_users + len(self.deactivated_users),
+        }
 
     async def _send_info_message(self, info_message_text: str) -> types.Message:
         """Send status message to admin"""
         return await self._bot.send_message(
             self.admin_id,
-            info_message_text.format(
-                sent=0,
-                failed=0,
-                blocked=0,
-                deleted=0,
-                limited=0,
-                deactivated=0,
-                batches=0
-            )
+            info_message_text.format(batches=0, **self._counters())
         )
 
     async def _update_info_message(
@@ -101,15 +158,7 @@ class Broadcaster:
             include_total: Whether to include total processed users count
         """
         try:
-            text = info_message_text.format(
-                sent=self.sent_messages_count,
-                failed=self.failed_messages_count,
-                blocked=len(self.blocked_users),
-                deleted=len(self.deleted_users),
-                limited=len(self.limited_users),
-                deactivated=len(self.deactivated_users),
-                batches=self.processed_batches
-            )
+            text = info_message_text.format(batches=self.processed_batches, **self._counters())
 
             if include_total:
                 text += f"\n\nВсего обработано: {self.total_processed} пользователей"
@@ -119,14 +168,66 @@ class Broadcaster:
         except Exception as e:
             logger.error(f"Error updating info message: {e}")
 
+    async def _checkpoint(self) -> None:
+        """Flush user statuses and persist job progress (also renews the job lease)"""
+        async with self._db_lock:
+            if self.blocked_users or self.deleted_users or self.limited_users or self.deactivated_users:
+                # Забираем списки до записи - воркеры продолжают добавлять в новые
+                blocked, self.blocked_users = self.blocked_users, []
+                deleted, self.deleted_users = self.deleted_users, []
+                limited, self.limited_users = self.limited_users, []
+                deactivated, self.deactivated_users = self.deactivated_users, []
+
+                try:
+                    await self._mark_user_statuses(
+                        blocked_user_ids=blocked,
+                        deleted_user_ids=deleted,
+                        limited_users_ids=limited,
+                        deactivated_user_ids=deactivated
+                    )
+                except Exception:
+                    # Вернём в списки - попробуем на следующем чекпоинте
+                    self.blocked_users.extend(blocked)
+                    self.deleted_users.extend(deleted)
+                    self.limited_users.extend(limited)
+                    self.deactivated_users.extend(deactivated)
+                    raise
+
+                # Обновляем число пользователей,
+                # которые заблокировали бота или удалили аккаунт
+                # или чей аккаунт был деактивирован
+                self.total_blocked_users += len(blocked)
+                self.total_deleted_users += len(deleted)
+                self.total_limited_users += len(limited)
+                self.total_deactivated_users += len(deactivated)
+
+            await BroadcastJobActions(self._session).save_checkpoint(
+                self.job_id, self.last_user_id, self._counters(), JOB_LEASE
+            )
+
+    async def _heartbeat(self, info_message: Message, info_message_text: str, stop: asyncio.Event) -> None:
+        """Periodic checkpoint + status message edit until `stop` is set"""
+        while True:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.status_update_interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self._checkpoint()
+            except Exception as e:
+                logger.error(f"Broadcast job {self.job_id} checkpoint error: {e}")
+            await self._update_info_message(info_message, info_message_text)
+
     async def broadcast(self) -> tuple[int, int, int, int]:
         """
-        Start broadcasting messages to all users
+        Send the job's message to all reachable users, starting after the checkpoint
 
         Returns:
             Tuple of (blocked_count, deleted_count, limited_count, deactivated_count)
         """
         info_message_text = (
+            f"Рассылка #{self.job_id}\n"
             "Отправка сообщений: {sent}\n"
             "Не удалось отправить: {failed}\n"
             "Заблокировали: {blocked}\n"
@@ -138,47 +239,34 @@ class Broadcaster:
 
         # Инициализация сообщения со статусом
         info_message = await self._send_info_message(info_message_text)
+        stop_heartbeat = asyncio.Event()
+        heartbeat = asyncio.create_task(self._heartbeat(info_message, info_message_text, stop_heartbeat))
+        # None - рассылка прервана (отмена задачи): задача остаётся running до истечения аренды
+        status: str | None = None
+        error: str | None = None
 
         try:
-            logger.info("Starting batch broadcast")
+            logger.info(f"Starting broadcast job {self.job_id} after tg_id {self.last_user_id}")
 
             # Обрабатываем пользователей пачками
             users_actions = UserActions(self._session)
-            async for user_ids, offset in users_actions.iterate_user_ids(self.batch_size):
+            while True:
+                async with self._db_lock:
+                    user_ids = await users_actions.get_user_ids_batch(self.last_user_id, self.batch_size)
+                if not user_ids:
+                    break
+
                 # Обрабатываем текущую пачку пользователей
-                await self._process_batch(user_ids, info_message, info_message_text)
+                await self._process_batch(user_ids)
 
                 self.processed_batches += 1
                 self.total_processed += len(user_ids)
 
-                # Обновляем сообщение о статусе после каждой пачки
-                await self._update_info_message(info_message, info_message_text)
-
-                # Если есть заблокированные пользователи, помечаем их в базе данных
-                if self.blocked_users or self.deleted_users or self.limited_users or self.deactivated_users:
-                    await self._mark_user_statuses(
-                        blocked_user_ids=self.blocked_users,
-                        deleted_user_ids=self.deleted_users,
-                        limited_users_ids=self.limited_users,
-                        deactivated_user_ids=self.deactivated_users
-                    )
-
-                    # Обновляем число пользователей,
-                    # которые заблокировали бота или удалили аккаунт
-                    # или чей аккаунт был деактивирован
-                    self.total_blocked_users += len(self.blocked_users)
-                    self.total_deleted_users += len(self.deleted_users)
-                    self.total_limited_users += len(self.limited_users)
-                    self.total_deactivated_users += len(self.deactivated_users)
-
-                    # Очищаем списки, так как уже обработали
-                    self.blocked_users = []
-                    self.deleted_users = []
-                    self.limited_users = []
-                    self.deactivated_users = []
+                # Сохраняем прогресс после каждой пачки
+                await self._checkpoint()
 
             logger.info(
-                f"Broadcasting completed: {self.sent_messages_count} sent, "
+                f"Broadcast job {self.job_id} completed: {self.sent_messages_count} sent, "
                 f"{self.failed_messages_count} failed, "
                 f"{self.total_blocked_users} blocked, "
                 f"{self.total_deleted_users} deleted, "
@@ -186,87 +274,95 @@ class Broadcaster:
                 f"{self.total_deactivated_users} deactivated accounts, "
                 f"{self.processed_batches} batches processed"
             )
+            status = "done"
 
         except Exception as e:
+            status = "failed"
+            error = str(e)
             logger.error(f"Broadcasting error: {e}")
             await self._bot.send_message(
                 self.admin_id,
                 f"Ошибка при рассылке: {e}"
             )
         finally:
+            # Не прерываем heartbeat посреди записи в БД - дожидаемся его выхода
+            stop_heartbeat.set()
+            await heartbeat
+
             # Финальное обновление статуса
             try:
                 await self._update_info_message(info_message, info_message_text, include_total=True)
             except Exception as e:
                 logger.error(f"Error in final update: {e}")
 
-            # Удаляем предпросмотр рассылки
-            await self._delete_preview()
+            # Помечаем оставшихся заблокированных пользователей и закрываем задачу
+            if status is None:
+                logger.warning(f"Broadcast job {self.job_id} interrupted, it will be resumed after the lease expires")
+            else:
+                try:
+                    await self._checkpoint()
+                    await BroadcastJobActions(self._session).finish_job(self.job_id, status, self._counters(), error)
+                except Exception as e:
+                    logger.error(f"Failed to finish broadcast job {self.job_id}: {e}")
 
-            # Помечаем оставшихся заблокированных пользователей
-            if self.blocked_users or self.deleted_users or self.limited_users or self.deactivated_users:
-                await self._mark_user_statuses(
-                    blocked_user_ids=self.blocked_users,
-                    deleted_user_ids=self.deleted_users,
-                    limited_users_ids=self.limited_users,
-                    deactivated_user_ids=self.deactivated_users
-                )
+            # Удаляем предпросмотр только после полной рассылки - он нужен для продолжения
+            if status == "done":
+                await self._delete_preview()
 
         return (
             self.total_blocked_users, self.total_deleted_users,
             self.total_limited_users, self.total_deactivated_users
         )
 
-    async def _process_batch(
-            self,
-            user_ids: list[int],
-            info_message: Message,
-            info_message_text: str
-    ) -> None:
+    async def _process_batch(self, user_ids: list[int]) -> None:
         """
-        Process a batch of users
+        Process a batch of users with concurrent workers
+
+        `last_user_id` advances only over the contiguous prefix of finished
+        users, so a checkpoint never skips a user that is still in flight.
 
         Args:
-            user_ids: List of user IDs to process
-            info_message: Status message to update
-            info_message_text: Template for status message
+            user_ids: List of user IDs to process (ascending)
         """
-        batch_sent = 0
-        batch_failed = 0
-        should_update = False
-
-        for user_id in user_ids:
-            result = await self._send_broadcasting_message(user_id)
-
-            if result is True:
-                self.sent_messages_count += 1
-                batch_sent += 1
-            else:
-                self.failed_messages_count += 1
-                batch_failed += 1
-
-                if isinstance(result, int):
-                    self.blocked_users.append(user_id)
-                elif result == "deactivated":
-                    self.deactivated_users.append(user_id)
-                elif result == "limited":
-                    self.limited_users.append(user_id)
-                elif result == "deleted":
-                    self.deleted_users.append(user_id)
-
-            await asyncio.sleep(self.sleep_seconds)
-
-            # Периодическое обновление статуса внутри пачки
-            # Обновляем каждые N сообщений
-            if batch_sent > 0 and batch_sent % (self.message_per_second * 4) == 0:
-                should_update = True
-            # Обновляем каждые N ошибок
-            elif batch_failed > 0 and batch_failed % (self.message_per_second * 2) == 0:
-                should_update = True
-
-            if should_update:
-                await self._update_info_message(info_message, info_message_text)
-                should_update = False
+        queue: asyncio.Queue[int] = asyncio.Queue()
+        for index in range(len(user_ids)):
+            queue.put_nowait(index)
+
+        done = [False] * len(user_ids)
+        frontier = 0
+
+        async def worker() -> None:
+            nonlocal frontier
+            while True:
+                try:
+                    index = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                user_id = user_ids[index]
+                result = await self._send_broadcasting_message(user_id)
+
+                if result is True:
+                    self.sent_messages_count += 1
+                else:
+                    self.failed_messages_count += 1
+
+                    if isinstance(result, int):
+                        self.blocked_users.append(user_id)
+                    elif result == "deactivated":
+                        self.deactivated_users.append(user_id)
+                    elif result == "limited":
+                        self.limited_users.append(user_id)
+                    elif result == "deleted":
+                        self.deleted_users.append(user_id)
+
+                done[index] = True
+                while frontier < len(done) and done[frontier]:
+                    frontier += 1
+                if frontier:
+                    self.last_user_id = user_ids[frontier - 1]
+
+        await asyncio.gather(*(worker() for _ in range(min(self.workers, len(user_ids)))))
 
     async def _send_broadcasting_message(self, user_id: int) -> Union[bool, int, str]:
         """
@@ -283,18 +379,21 @@ class Broadcaster:
             "deactivated" if account deactivated,
             False otherwise
         """
+        await self._bucket.acquire()
         try:
-            if self.broadcasting_message:
+            if len(self.message_ids) == 1:
                 await self._bot.copy_message(
                     chat_id=user_id,
-                    from_chat_id=self.broadcasting_message.from_user.id,
-                    message_id=self.broadcasting_message.message_id,
-                    reply_markup=self.broadcasting_message.reply_markup
+                    from_chat_id=self.from_chat_id,
+                    message_id=self.message_ids[0],
+                    reply_markup=self.reply_markup
                 )
             else:
-                await self._bot.send_media_group(
+                # Альбом копируется одним запросом с сохранением группировки
+                await self._bot.copy_messages(
                     chat_id=user_id,
-                    media=self._make_sendable_album(self.album)
+                    from_chat_id=self.from_chat_id,
+                    message_ids=self.message_ids
                 )
             logger.debug(f"Target [ID:{user_id}]: message sent successfully")
             return True
@@ -320,8 +419,8 @@ class Broadcaster:
             return False
 
         except TelegramRetryAfter as e:
-            logger.warning(f"Target [ID:{user_id}]: Flood limit exceeded. Sleeping {e.retry_after} seconds.")
-            await asyncio.sleep(e.retry_after)
+            logger.warning(f"Target [ID:{user_id}]: Flood limit exceeded. Pausing all sends for {e.retry_after} seconds.")
+            self._bucket.pause(e.retry_after)
             return await self._send_broadcasting_message(user_id)
 
         except TelegramAPIError as e:
@@ -393,7 +492,7 @@ class Broadcaster:
                 stmt = update(User).where(User.tg_id.in_(deactivated_user_ids)).values(status="deactivated")
                 await self._session.execute(stmt)
                 logger.info(f"Marked {len(deactivated_user_ids)} users as DEACTIVATED")
-            
+
             await self._session.commit()
 
         except Exception as e:
@@ -404,81 +503,53 @@ class Broadcaster:
     async def _delete_preview(self) -> None:
         """Delete preview messages from admin chat"""
         try:
-            if self.broadcasting_message:
-                await self._bot.delete_message(
-                    chat_id=self.admin_id,
-                    message_id=self.broadcasting_message.message_id
-                )
-            elif self.album:
-                await self._bot.delete_messages(
-                    chat_id=self.admin_id,
-                    message_ids=[message.message_id for message in self.album]
-                )
+            await self._bot.delete_messages(
+                chat_id=self.from_chat_id,
+                message_ids=self.message_ids
+            )
         except Exception as e:
             logger.error(f"Failed to delete preview: {e}")
 
-    def _make_sendable_album(self, album: list[Message]) -> list[
-        Union[
-            InputMediaPhoto, InputMediaVideo,
-            InputMediaAnimation, InputMediaDocument, InputMediaAudio
-        ]
-    ]:
-        """Convert message album to sendable media group"""
-        if not album:
-            raise ValueError("Album is empty")
-
-        media_list = []
-        for message in album:
-            media = self._make_album_media(message)
-            if media:
-                media_list.append(media)
-
-        if not media_list:
-            raise ValueError("No valid media found in album")
-
-        return media_list
-
-    @staticmethod
-    def _make_album_media(message: types.Message) -> Optional[
-        Union[
-            InputMediaPhoto, InputMediaVideo,
-            InputMediaAnimation, InputMediaDocument, InputMediaAudio
-        ]
-    ]:
-        """Convert single message to appropriate InputMedia type"""
-        try:
-            if message.content_type == types.ContentType.PHOTO:
-                return InputMediaPhoto(
-                    media=message.photo[-1].file_id,
-                    caption=message.html_text if hasattr(message, 'html_text') else None,
-                    has_spoiler=message.has_media_spoiler if hasattr(message, 'has_media_spoiler') else None
-                )
-            elif message.content_type == types.ContentType.VIDEO:
-                return InputMediaVideo(
-                    media=message.video.file_id,
-                    caption=message.html_text if hasattr(message, 'html_text') else None,
-                    has_spoiler=message.has_media_spoiler if hasattr(message, 'has_media_spoiler') else None
-                )
-            elif message.content_type == types.ContentType.ANIMATION:
-                return InputMediaAnimation(
-                    media=message.animation.file_id,
-                    caption=message.html_text if hasattr(message, 'html_text') else None,
-                    has_spoiler=message.has_media_spoiler if hasattr(message, 'has_media_spoiler') else None
-                )
-            elif message.content_type == types.ContentType.DOCUMENT:
-                return InputMediaDocument(
-                    media=message.document.file_id,
-                    caption=message.html_text if hasattr(message, 'html_text') else None
-                )
-            elif message.content_type == types.ContentType.AUDIO:
-                return InputMediaAudio(
-                    media=message.audio.file_id,
-                    caption=message.html_text if hasattr(message, 'html_text') else None
-                )
-            else:
-                logger.warning(f"Unsupported content type: {message.content_type}")
-                return None
 
+def wake_broadcast_worker() -> None:
+    """Let the worker pick up a newly created job without waiting for the next poll"""
+    _wakeup.set()
+
+
+async def _fail_job(bot: Bot, session: AsyncSession, job: BroadcastJob, error: Exception) -> None:
+    logger.error(f"Broadcast job {job.job_id} failed to start: {error}")
+    await session.rollback()
+    await BroadcastJobActions(session).finish_job(job.job_id, "failed", {}, str(error))
+    try:
+        await bot.send_message(job.admin_id, f"Ошибка при запуске рассылки #{job.job_id}: {html.escape(str(error))}")
+    except Exception as e:
+        logger.error(f"Failed to notify admin about broadcast job {job.job_id}: {e}")
+
+
+async def broadcast_worker(bot: Bot, session_pool: async_sessionmaker, poll_interval: float = BROADCAST_POLL_INTERVAL):
+    """
+    Run persisted broadcast jobs one at a time.
+
+    On startup this also resumes a job interrupted by a restart (once its
+    lease has expired) from its last checkpoint.
+    """
+    while True:
+        _wakeup.clear()
+        try:
+            async with session_pool() as session:
+                job = await BroadcastJobActions(session).claim_next_job(JOB_LEASE)
+                if job:
+                    try:
+                        await Broadcaster(bot, session, job).broadcast()
+                    except Exception as e:
+                        # Ошибка до начала рассылки (битый payload и т.п.) - иначе задача
+                        # снова и снова подхватывалась бы после истечения аренды
+                        await _fail_job(bot, session, job, e)
+                    continue
         except Exception as e:
-            logger.error(f"Error creating media object: {e}")
-            return None
\ No newline at end of file
+            logger.error(f"Broadcast worker error: {e}")
+
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=poll_interval)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,33 @@
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.services.episode_layout import EpisodeLayoutCache
+from src.app.services.leaderboard import Leaderboard
+from src.app.services.search_index import TitleSearchIndex
+from src.app.services.title_cache import TitleCache
+
+logger = logging.getLogger(__name__)
+
+
+async def sync_titles(session: AsyncSession, redis_url: str, *codes: int) -> None:
+    """Admin o'zgarishlaridan keyin katalog indekslari va keshlarini yangilash
+
+    Args:
+        session: DB session
+        redis_url: Redis URL
+        codes: O'zgargan (yoki o'chirilgan) film kodlari
+    """
+    codes = {c for c in codes if c is not None}
+    for code in codes:
+        try:
+            await TitleSearchIndex.reload_code(session, code)
+        except Exception as e:
+            logger.error(f"Error syncing title {code}: {e}")
+
+    await TitleCache.invalidate(redis_url, *codes)
+    await EpisodeLayoutCache.invalidate(redis_url, *codes)
+
+    # O'chirilgan kodlar reytingda qolmasin
+    if TitleSearchIndex.is_ready():
+        await Leaderboard.remove(redis_url, *(c for c in codes if TitleSearchIndex.get(c) is None))
@@ -0,0 +1,132 @@
+import logging
+from dataclasses import dataclass, field
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.common.lru import LRUCache
+from src.app.database.queries.movie.mini_series import MiniSeriesActions
+from src.app.database.queries.movie.series import SeriesActions
+from src.app.services.cache_service import CacheService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class EpisodeLayout:
+    """Serial/mini-serial qismlarining ixcham, oldindan hisoblangan tartibi
+
+    Qismlar (season, series) bo'yicha tartiblangan parallel massivlarda
+    saqlanadi; navigatsiya uchun kerakli hamma narsa O(1) da olinadi.
+    """
+
+    code: int
+    seasons: tuple[int, ...]
+    series: tuple[int, ...]
+    file_ids: tuple[str, ...]
+    captions: tuple[str | None, ...]
+    # season -> (birinchi qism indeksi, fasldagi qismlar soni)
+    season_offsets: dict[int, tuple[int, int]] = field(init=False)
+    positions: dict[tuple[int, int], int] = field(init=False)
+
+    def __post_init__(self):
+        self.season_offsets = {}
+        self.positions = {}
+        for index, (season, series) in enumerate(zip(self.seasons, self.series)):
+            start, count = self.season_offsets.get(season, (index, 0))
+            self.season_offsets[season] = (start, count + 1)
+            self.positions[(season, series)] = index
+
+    @classmethod
+    def from_rows(cls, code: int, rows: list[tuple[int, int, str, str | None]]) -> "EpisodeLayout":
+        seasons, series, file_ids, captions = zip(*rows) if rows else ((), (), (), ())
+        return cls(code, tuple(seasons), tuple(series), tuple(file_ids), tuple(captions))
+
+    def __len__(self) -> int:
+        return len(self.file_ids)
+
+    @property
+    def seasons_count(self) -> int:
+        return max(self.season_offsets, default=0)
+
+    def find(self, season: int, series: int) -> int | None:
+        return self.positions.get((season, series))
+
+    def season_size(self, season: int) -> int:
+        return self.season_offsets.get(season, (0, 0))[1]
+
+    def to_dict(self) -> dict:
+        return {
+            "code": self.code,
+            "seasons": self.seasons,
+            "series": self.series,
+            "file_ids": self.file_ids,
+            "captions": self.captions,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "EpisodeLayout":
+        return cls(
+            data["code"],
+            tuple(data["seasons"]),
+            tuple(data["series"]),
+            tuple(data["file_ids"]),
+            tuple(data["captions"]),
+        )
+
+
+class EpisodeLayoutCache:
+    """Kod -> EpisodeLayout keshi: jarayon ichidagi LRU + Redis, DB'dan read-through"""
+
+    KEY_PREFIX = "layout:"
+    REDIS_TTL = 600
+    _local = LRUCache(maxsize=512, ttl=60)
+
+    @classmethod
+    def _key(cls, kind: str, code: int) -> str:
+        return f"{cls.KEY_PREFIX}{kind}:{code}"
+
+    @classmethod
+    async def get(cls, session: AsyncSession, redis_url: str, kind: str, code: int) -> EpisodeLayout | None:
+        """Layout olish
+
+        Args:
+            session: DB session (kesh bo'sh bo'lsa)
+            redis_url: Redis URL
+            kind: 'series' | 'mini_series'
+            code: Serial kodi
+
+        Returns:
+            EpisodeLayout yoki None (qismlar topilmasa)
+        """
+        key = cls._key(kind, code)
+        layout = cls._local.get(key)
+        if layout is not None:
+            return layout
+
+        cached = await CacheService.get_cached(redis_url, key)
+        if cached:
+            try:
+                layout = EpisodeLayout.from_dict(cached)
+            except (KeyError, TypeError):
+                layout = None
+
+        if layout is None:
+            if kind == "series":
+                rows = await SeriesActions(session).get_episode_rows(code)
+            else:
+                rows = await MiniSeriesActions(session).get_episode_rows(code)
+            if not rows:
+                return None
+            layout = EpisodeLayout.from_rows(code, rows)
+            await CacheService.set_cached(redis_url, key, layout.to_dict(), ttl=cls.REDIS_TTL)
+
+        cls._local.set(key, layout)
+        return layout
+
+    @classmethod
+    async def invalidate(cls, redis_url: str, *codes: int) -> None:
+        for code in codes:
+            for kind in ("series", "mini_series"):
+                key = cls._key(kind, code)
+                cls._local.pop(key)
+                await CacheService.delete_cached(redis_url, key)
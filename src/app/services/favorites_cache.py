@@ -0,0 +1,84 @@
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.database.queries.movie.favorite_movies import FavoriteMoviesActions
+from src.app.services.cache_service import CacheService
+
+logger = logging.getLogger(__name__)
+
+
+class FavoritesCache:
+    """Foydalanuvchi sevimlilari to'plami - Redis set `favs:{user_id}`
+
+    To'plam birinchi so'rovda DB'dan to'liq yuklanadi. SENTINEL a'zosi
+    to'plam yuklanganini bildiradi, shuning uchun bo'sh sevimlilar ham
+    keshlanadi. Qo'shish/o'chirish to'plamni o'zgartirmaydi - versiyani
+    oshirib kalitni o'chiradi. Yuklash versiya o'zgarmagan bo'lsagina
+    yoziladi, aks holda eski DB natijasi yangi yozuvni bosib ketardi.
+    """
+
+    KEY_PREFIX = "favs:"
+    SENTINEL = "_"
+    TTL = 86400
+
+    # KEYS: set, version; ARGV: o'qilgan versiya, ttl, sentinel, kodlar...
+    # SADD bo'laklab chaqiriladi - butun ro'yxatni unpack qilish Lua stek chegarasiga uriladi
+    LOAD_LUA = """
+    if (redis.call('GET', KEYS[2]) or '') ~= ARGV[1] then
+        return 0
+    end
+    redis.call('DEL', KEYS[1])
+    for i = 3, #ARGV, 1000 do
+        redis.call('SADD', KEYS[1], unpack(ARGV, i, math.min(i + 999, #ARGV)))
+    end
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+    return 1
+    """
+
+    _load_script = None
+
+    @classmethod
+    def _key(cls, user_id: int) -> str:
+        return f"{cls.KEY_PREFIX}{user_id}"
+
+    @classmethod
+    def _version_key(cls, user_id: int) -> str:
+        return f"{cls.KEY_PREFIX}{user_id}:v"
+
+    @classmethod
+    async def is_saved(cls, session: AsyncSession, redis_url: str, user_id: int, movie_code: int) -> bool:
+        """Film foydalanuvchi sevimlilarida bormi - odatda bitta SMISMEMBER"""
+        key = cls._key(user_id)
+        try:
+            redis = await CacheService.get_redis(redis_url)
+            saved, loaded = await redis.smismember(key, [movie_code, cls.SENTINEL])
+            if loaded:
+                return bool(saved)
+
+            # Versiya DB o'qishdan oldin olinadi - oradagi yozuv yuklashni bekor qiladi
+            version = await redis.get(cls._version_key(user_id)) or ""
+            codes = await FavoriteMoviesActions(session).get_favorite_codes(user_id)
+            if cls._load_script is None:
+                cls._load_script = redis.register_script(cls.LOAD_LUA)
+            await cls._load_script(
+                keys=[key, cls._version_key(user_id)],
+                args=[version, cls.TTL, cls.SENTINEL, *codes],
+            )
+            return movie_code in codes
+        except Exception as e:
+            logger.error(f"Favorites cache error for user {user_id}: {e}")
+            return bool(await FavoriteMoviesActions(session).get_favorites(movie_code, user_id))
+
+    @classmethod
+    async def invalidate(cls, redis_url: str, user_id: int) -> None:
+        """DB'dagi o'zgarishdan keyin chaqiriladi - keyingi o'qish to'plamni qayta yuklaydi"""
+        try:
+            redis = await CacheService.get_redis(redis_url)
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.incr(cls._version_key(user_id))
+                pipe.expire(cls._version_key(user_id), cls.TTL)
+                pipe.delete(cls._key(user_id))
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Favorites cache invalidate error for user {user_id}: {e}")
@@ -0,0 +1,74 @@
+import heapq
+from array import array
+
+from src.app.common.genres import genres_to_mask
+from src.app.services.search_index import TitleEntry, TitleSearchIndex
+
+
+class GenreEngine:
+    """Janr bo'yicha qidiruv uchun butun katalogning ixcham massivlari
+
+    Har bir film uchun (code, mask, score) parallel `array`larda saqlanadi:
+    janr to'plami 16-bitli maska, tanlangan janrlar bilan kesishish bitta AND.
+    Katalog TitleSearchIndex'dan olinadi va u o'zgarganda qayta quriladi;
+    score'lar leaderboard yangilanganda `set_scores` orqali keladi. Leaderboard
+    balli hali yo'q filmlar uchun indeksdagi views_count ishlatiladi - startup'da
+    va Redis bo'sh bo'lganda ham natija ma'noli bo'ladi.
+    """
+
+    _codes = array("q")
+    _masks = array("H")
+    _scores = array("d")
+    _views = array("d")
+    _version: int = -1
+    _latest_scores: dict[int, float] = {}
+
+    @classmethod
+    def _ensure(cls) -> None:
+        version = TitleSearchIndex.version()
+        if version == cls._version:
+            return
+
+        entries = TitleSearchIndex.entries()
+        cls._codes = array("q", (e.code for e in entries))
+        cls._masks = array("H", (genres_to_mask(e.genres) for e in entries))
+        cls._views = array("d", (e.views for e in entries))
+        cls._version = version
+        cls._apply_scores()
+
+    @classmethod
+    def _apply_scores(cls) -> None:
+        scores = cls._latest_scores
+        cls._scores = array("d", (scores.get(code, views) for code, views in zip(cls._codes, cls._views)))
+
+    @classmethod
+    def set_scores(cls, scores: dict[int, float]) -> None:
+        """Reyting ballarini yangilash (code -> views + favs * 10)"""
+        cls._latest_scores = scores
+        if TitleSearchIndex.version() != cls._version:
+            cls._ensure()
+        else:
+            cls._apply_scores()
+
+    @classmethod
+    def top(cls, genres: list[str], limit: int = 10) -> list[tuple[TitleEntry, float]]:
+        """Tanlangan janrlardan kamida bittasi bor top filmlar
+
+        Returns:
+            (TitleEntry, score) ro'yxati, score bo'yicha kamayish tartibida
+        """
+        selected = genres_to_mask(genres)
+        if not selected:
+            return []
+
+        cls._ensure()
+        masks, scores = cls._masks, cls._scores
+        matches = [i for i, mask in enumerate(masks) if mask & selected]
+        best = heapq.nlargest(limit, matches, key=scores.__getitem__)
+
+        results = []
+        for i in best:
+            entry = TitleSearchIndex.get(cls._codes[i])
+            if entry is not None:
+                results.append((entry, scores[i]))
+        return results
@@ -0,0 +1,215 @@
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.app.database.queries.movie.top_movies import TopMoviesActions
+from src.app.database.queries.movie.view_buckets import ViewBucketActions
+from src.app.services.cache_service import CacheService
+from src.app.services.genre_engine import GenreEngine
+from src.app.services.search_index import TitleSearchIndex
+
+logger = logging.getLogger(__name__)
+
+TITLE_KIND_LABEL = {"feature_film": "Film", "series": "Serial", "mini_series": "Epizodli film"}
+
+
+def views_day_key(day: date) -> str:
+    return f"lb:views:{day:%Y%m%d}"
+
+
+def favs_day_key(day: date) -> str:
+    return f"lb:favs:{day:%Y%m%d}"
+
+
+VIEWS_TOTAL_KEY = "lb:views:total"
+FAVS_TOTAL_KEY = "lb:favs:total"
+# Seed bajarilganini bildiradi - totals kalitlari flush'dan keyin record_view orqali qayta paydo bo'ladi
+SEEDED_KEY = "lb:seeded"
+
+
+class Leaderboard:
+    """Redis sorted set'larda saqlanadigan top filmlar reytingi
+
+    Ko'rish va saqlash hodisalari kunlik (`lb:views:YYYYMMDD`, `lb:favs:YYYYMMDD`)
+    va umumiy zset'larga ZINCRBY qilinadi. Fon vazifasi har bir interval uchun
+    `top:{interval}` (score = views + favs * 10) va uning views/favs qismlarini
+    ZUNIONSTORE bilan tayyorlab qo'yadi - o'qishda agregatsiya yo'q.
+    """
+
+    INTERVAL_DAYS = {"day": 1, "week": 7, "month": 30}
+    FAV_WEIGHT = 10
+    DAY_KEY_TTL = 32 * 86400
+    REFRESH_INTERVAL = 60
+
+    @staticmethod
+    def _day_keys(key_func, days: int) -> list[str]:
+        today = date.today()
+        return [key_func(today - timedelta(days=i)) for i in range(days)]
+
+    @classmethod
+    def _sources(cls, interval: str) -> tuple[list[str], list[str]]:
+        if interval == "total":
+            return [VIEWS_TOTAL_KEY], [FAVS_TOTAL_KEY]
+        days = cls.INTERVAL_DAYS[interval]
+        return cls._day_keys(views_day_key, days), cls._day_keys(favs_day_key, days)
+
+    @classmethod
+    async def record_favorite(cls, redis_url: str, movie_code: int, delta: int = 1) -> None:
+        """Saqlanganlar sonini o'zgartirish (+1 qo'shildi, -1 o'chirildi)"""
+        try:
+            redis = await CacheService.get_redis(redis_url)
+            day_key = favs_day_key(date.today())
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.zincrby(FAVS_TOTAL_KEY, delta, movie_code)
+                pipe.zincrby(day_key, delta, movie_code)
+                pipe.expire(day_key, cls.DAY_KEY_TTL)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Leaderboard favorite error for movie {movie_code}: {e}")
+
+    @classmethod
+    async def remove(cls, redis_url: str, *codes: int) -> None:
+        """O'chirilgan filmlarni barcha reytinglardan olib tashlash"""
+        if not codes:
+            return
+        try:
+            redis = await CacheService.get_redis(redis_url)
+            keys = [VIEWS_TOTAL_KEY, FAVS_TOTAL_KEY]
+            keys += cls._day_keys(views_day_key, 31) + cls._day_keys(favs_day_key, 31)
+            keys += [f"top:{interval}{part}" for interval in ("total", *cls.INTERVAL_DAYS) for part in ("", ":views", ":favs")]
+            async with redis.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.zrem(key, *codes)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Leaderboard remove error for {codes}: {e}")
+
+    @classmethod
+    async def refresh(cls, redis_url: str) -> None:
+        """`top:{interval}` zset'larini qayta hisoblash"""
+        redis = await CacheService.get_redis(redis_url)
+        async with redis.pipeline(transaction=False) as pipe:
+            for interval in ("total", *cls.INTERVAL_DAYS):
+                views_keys, favs_keys = cls._sources(interval)
+                weights = {key: 1 for key in views_keys}
+                weights.update({key: cls.FAV_WEIGHT for key in favs_keys})
+                pipe.zunionstore(f"top:{interval}", weights)
+                pipe.zunionstore(f"top:{interval}:views", views_keys)
+                pipe.zunionstore(f"top:{interval}:favs", favs_keys)
+            await pipe.execute()
+
+    @classmethod
+    async def get_scores(cls, redis_url: str, interval: str = "total") -> dict[int, float]:
+        """Intervaldagi barcha filmlar ballari (code -> score)"""
+        redis = await CacheService.get_redis(redis_url)
+        return {int(code): score for code, score in await redis.zrange(f"top:{interval}", 0, -1, withscores=True)}
+
+    @classmethod
+    async def get_stats(cls, redis_url: str, codes: list[int], interval: str = "total") -> list[tuple[int, int]]:
+        """Berilgan kodlar uchun (views, favs) - bitta pipeline"""
+        if not codes:
+            return []
+        try:
+            redis = await CacheService.get_redis(redis_url)
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.zmscore(f"top:{interval}:views", codes)
+                pipe.zmscore(f"top:{interval}:favs", codes)
+                views, favs = await pipe.execute()
+        except Exception as e:
+            logger.error(f"Leaderboard stats error: {e}")
+            return [(0, 0)] * len(codes)
+        return [(int(v or 0), int(f or 0)) for v, f in zip(views, favs)]
+
+    @classmethod
+    async def get_top(cls, redis_url: str, interval: str = "total", limit: int = 20) -> list[dict] | None:
+        """Top filmlar - TopMoviesActions.get_top_movies bilan bir xil formatda
+
+        Returns:
+            Natijalar ro'yxati yoki None (reyting hali tayyor emas / Redis xatosi)
+        """
+        # Nom va turlar indeksdan olinadi
+        if not TitleSearchIndex.is_ready():
+            return None
+
+        try:
+            redis = await CacheService.get_redis(redis_url)
+            # O'chirilgan kodlar uchun biroz zaxira bilan olamiz
+            top = await redis.zrevrange(f"top:{interval}", 0, limit * 2 - 1, withscores=True)
+            if not top:
+                return None
+
+            codes = [code for code, _ in top]
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.zmscore(f"top:{interval}:views", codes)
+                pipe.zmscore(f"top:{interval}:favs", codes)
+                views, favs = await pipe.execute()
+        except Exception as e:
+            logger.error(f"Leaderboard read error for {interval}: {e}")
+            return None
+
+        movies = []
+        for (code, score), view_count, fav_count in zip(top, views, favs):
+            entry = TitleSearchIndex.get(int(code))
+            if entry is None:
+                continue
+            movies.append({
+                "code": entry.code,
+                "name": entry.name,
+                "type": TITLE_KIND_LABEL[entry.kind],
+                "favs": int(fav_count or 0),
+                "views": int(view_count or 0),
+                "score": int(score),
+            })
+            if len(movies) == limit:
+                break
+        return movies
+
+    @classmethod
+    async def seed(cls, session_pool: async_sessionmaker, redis_url: str) -> None:
+        """Redis bo'sh bo'lsa (birinchi ishga tushish / flush) reytingni DB'dan to'ldirish
+
+        Kunlik ko'rishlar `view_buckets` jadvalidan olinadi.
+        """
+        redis = await CacheService.get_redis(redis_url)
+        if await redis.exists(SEEDED_KEY):
+            return
+
+        since = datetime.combine(date.today() - timedelta(days=30), datetime.min.time())
+        async with session_pool() as session:
+            top_actions = TopMoviesActions(session)
+            totals = await top_actions.get_leaderboard_totals()
+            favs_by_day = await top_actions.get_favorite_counts_by_day(since)
+            views_by_day = await ViewBucketActions(session).get_view_counts_by_day(since)
+
+        async with redis.pipeline(transaction=False) as pipe:
+            views_total = {code: views for code, views, _ in totals}
+            favs_total = {code: favs for code, _, favs in totals if favs}
+            if views_total:
+                pipe.zadd(VIEWS_TOTAL_KEY, views_total)
+            if favs_total:
+                pipe.zadd(FAVS_TOTAL_KEY, favs_total)
+            for day, code, count in favs_by_day:
+                day_key = favs_day_key(day.date())
+                pipe.zadd(day_key, {code: count})
+                pipe.expire(day_key, cls.DAY_KEY_TTL)
+            for day, code, count in views_by_day:
+                day_key = views_day_key(day.date())
+                pipe.zadd(day_key, {code: count})
+                pipe.expire(day_key, cls.DAY_KEY_TTL)
+            pipe.set(SEEDED_KEY, "1")
+            await pipe.execute()
+
+        logger.info(f"Leaderboard seeded with {len(totals)} titles")
+
+
+async def leaderboard_refresher(session_pool: async_sessionmaker, redis_url: str, interval: int = Leaderboard.REFRESH_INTERVAL) -> None:
+    while True:
+        try:
+            await Leaderboard.seed(session_pool, redis_url)
+            await Leaderboard.refresh(redis_url)
+            GenreEngine.set_scores(await Leaderboard.get_scores(redis_url, "total"))
+        except Exception as e:
+            logger.exception(e)
+        await asyncio.sleep(interval)
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.app.database.queries.bots import BotActions
+from src.app.database.queries.channels import ChannelActions
+from src.app.services.cache_service import CacheService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class ChannelConfig:
+    channel_id: int
+    channel_name: str
+    channel_username: str | None
+    channel_url: str | None
+    active: bool
+
+
+@dataclass(frozen=True, slots=True)
+class BotConfig:
+    bot_username: str
+    bot_name: str
+    bot_url: str
+    active: bool
+
+
+@dataclass(frozen=True, slots=True)
+class OPConfig:
+    """Majburiy obuna (OP) sozlamalarining o'zgarmas nusxasi"""
+
+    channels: tuple[ChannelConfig, ...] = ()
+    bots: tuple[BotConfig, ...] = ()
+
+    @property
+    def active_channels(self) -> tuple[ChannelConfig, ...]:
+        return tuple(c for c in self.channels if c.active)
+
+    @property
+    def active_bots(self) -> tuple[BotConfig, ...]:
+        return tuple(b for b in self.bots if b.active)
+
+
+def _is_active(status) -> bool:
+    return status == "True" or status is True
+
+
+class OPConfigStore:
+    """Jarayon bo'yicha yagona OPConfig nusxasi
+
+    Admin OP dialoglarida o'zgarish bo'lganda `reload_and_publish` chaqiriladi:
+    nusxa darhol yangilanadi va Redis pub/sub orqali boshqa worker'larga
+    xabar beriladi (`listen` ularni qayta yuklaydi).
+    """
+
+    CHANNEL = "op_config:reload"
+    _snapshot: OPConfig | None = None
+    _instance_id = uuid.uuid4().hex
+
+    @classmethod
+    async def get(cls, session: AsyncSession) -> OPConfig:
+        if cls._snapshot is None:
+            await cls.reload(session)
+        return cls._snapshot
+
+    @classmethod
+    async def reload(cls, session: AsyncSession) -> OPConfig:
+        channels = await ChannelActions(session).get_all_channels()
+        bots = await BotActions(session).get_all_bots()
+        cls._snapshot = OPConfig(
+            channels=tuple(
+                ChannelConfig(
+                    channel_id=c.channel_id,
+                    channel_name=c.channel_name,
+                    channel_username=c.channel_username,
+                    channel_url=c.channel_url,
+                    active=_is_active(c.channel_status),
+                )
+                for c in channels
+            ),
+            bots=tuple(
+                BotConfig(
+                    bot_username=b.bot_username,
+                    bot_name=b.bot_name,
+                    bot_url=b.bot_url,
+                    active=_is_active(b.bot_status),
+                )
+                for b in bots
+            ),
+        )
+        return cls._snapshot
+
+    @classmethod
+    async def reload_and_publish(cls, session: AsyncSession, redis_url: str) -> None:
+        try:
+            await cls.reload(session)
+        except Exception as e:
+            logger.error(f"OP config reload error: {e}")
+            cls._snapshot = None
+
+        try:
+            redis = await CacheService.get_redis(redis_url)
+            await redis.publish(cls.CHANNEL, cls._instance_id)
+        except Exception as e:
+            logger.error(f"OP config publish error: {e}")
+
+    @classmethod
+    async def listen(cls, session_pool: async_sessionmaker, redis_url: str) -> None:
+        """Boshqa worker'lardan kelgan o'zgarish xabarlarini tinglash"""
+        while True:
+            try:
+                redis = await CacheService.get_redis(redis_url)
+                async with redis.pubsub() as pubsub:
+                    await pubsub.subscribe(cls.CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] != "message" or message["data"] == cls._instance_id:
+                            continue
+                        async with session_pool() as session:
+                            await cls.reload(session)
+                        logger.info("OP config reloaded from pub/sub")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"OP config listener error: {e}")
+                # Ulanish tiklanguncha o'tkazib yuborilgan xabarlar bo'lishi mumkin
+                cls._snapshot = None
+                await asyncio.sleep(5)
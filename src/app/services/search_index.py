@@ -0,0 +1,283 @@
+import logging
+from dataclasses import dataclass, replace
+
+from rapidfuzz import fuzz, process, utils
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.database.models import FeatureFilm, Series, MiniSeries
+
+logger = logging.getLogger(__name__)
+
+# Natijalarni tartiblashda turlar ketma-ketligi (eski qidiruvdagidek: film, serial, mini-serial)
+KIND_ORDER = {"feature_film": 0, "series": 1, "mini_series": 2}
+
+# Fuzzy qidiruv uchun minimal o'xshashlik (0-100) va qo'shimcha natijalar soni
+FUZZY_SCORE_CUTOFF = 75
+FUZZY_LIMIT = 10
+
+
+@dataclass(frozen=True, slots=True)
+class TitleEntry:
+    code: int
+    name: str
+    kind: str  # 'feature_film' | 'series' | 'mini_series'
+    genres: tuple[str, ...]
+    views: int = 0  # views_count (epizodlar yig'indisi) - yuklangan paytdagi qiymat
+
+
+def normalize_title(text: str) -> str:
+    """Nomni qidiruv uchun normallashtirish (case-fold + bo'shliqlarni siqish)"""
+    return " ".join(text.casefold().split())
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TitleSearchIndex:
+    """Barcha film nomlari bo'yicha xotiradagi trigram indeks
+
+    Startup'da bir marta quriladi va admin o'zgarishlaridan keyin
+    `reload_code` orqali kod bo'yicha yangilanadi.
+    """
+
+    _entries: dict[int, TitleEntry] = {}
+    _names: dict[int, tuple[str, ...]] = {}
+    _postings: dict[str, set[int]] = {}
+    _ready: bool = False
+    # Har bir o'zgarishda oshadi - hosila indekslar (GenreEngine) qayta qurilishi uchun
+    _version: int = 0
+
+    # Fuzzy qidiruv korpusi - o'zgarishdan keyin birinchi so'rovda qayta yig'iladi
+    _corpus: list[str] = []
+    _corpus_codes: list[int] = []
+    _corpus_dirty: bool = True
+
+    @classmethod
+    def is_ready(cls) -> bool:
+        return cls._ready
+
+    @classmethod
+    def version(cls) -> int:
+        return cls._version
+
+    @classmethod
+    def entries(cls) -> list[TitleEntry]:
+        return list(cls._entries.values())
+
+    @classmethod
+    async def build(cls, session: AsyncSession) -> None:
+        """Butun katalogni yuklab, indeksni noldan qurish"""
+        titles = await cls._load_titles(session)
+
+        entries: dict[int, TitleEntry] = {}
+        names: dict[int, tuple[str, ...]] = {}
+        postings: dict[str, set[int]] = {}
+        for entry, entry_names in titles:
+            entries[entry.code] = entry
+            names[entry.code] = entry_names
+            for gram in cls._grams_for(entry_names):
+                postings.setdefault(gram, set()).add(entry.code)
+
+        cls._entries, cls._names, cls._postings = entries, names, postings
+        cls._corpus_dirty = True
+        cls._version += 1
+        cls._ready = True
+        logger.info(f"Title search index built: {len(entries)} titles, {len(postings)} trigrams")
+
+    @classmethod
+    async def reload_code(cls, session: AsyncSession, code: int) -> None:
+        """Bitta kod uchun yozuvni bazadan qayta o'qish (yo'q bo'lsa - o'chiriladi)"""
+        titles = await cls._load_titles(session, code)
+        cls.remove(code)
+        for entry, entry_names in titles:
+            cls.upsert(entry, entry_names)
+
+    @classmethod
+    def upsert(cls, entry: TitleEntry, names: tuple[str, ...] | None = None) -> None:
+        cls.remove(entry.code)
+        names = names or (normalize_title(entry.name),)
+        cls._entries[entry.code] = entry
+        cls._names[entry.code] = names
+        for gram in cls._grams_for(names):
+            cls._postings.setdefault(gram, set()).add(entry.code)
+        cls._corpus_dirty = True
+        cls._version += 1
+
+    @classmethod
+    def remove(cls, code: int) -> None:
+        names = cls._names.pop(code, None)
+        cls._entries.pop(code, None)
+        if not names:
+            return
+        cls._corpus_dirty = True
+        cls._version += 1
+        for gram in cls._grams_for(names):
+            posting = cls._postings.get(gram)
+            if posting is None:
+                continue
+            posting.discard(code)
+            if not posting:
+                del cls._postings[gram]
+
+    @classmethod
+    def get(cls, code: int) -> TitleEntry | None:
+        return cls._entries.get(code)
+
+    @classmethod
+    def search(cls, query: str, limit: int | None = None, fuzzy: bool = False) -> list[tuple[TitleEntry, int]]:
+        """Nom bo'yicha qidirish - ILIKE '%q%' bilan bir xil semantika
+
+        Args:
+            query: Qidiruv so'zi
+            limit: Maksimal natijalar soni (None - hammasi)
+            fuzzy: Xato yozilgan so'rovlar uchun rapidfuzz natijalarini ham qo'shish
+
+        Returns:
+            List of (entry, score) tuples, score bo'yicha tartiblangan
+        """
+        q = normalize_title(query)
+        if not q:
+            return []
+
+        results = []
+        for code in cls._candidates(q):
+            score = max((cls._score(name, q) for name in cls._names[code]), default=0)
+            if score:
+                results.append((cls._entries[code], score))
+
+        results.sort(key=lambda x: (-x[1], KIND_ORDER.get(x[0].kind, 3), x[0].name))
+
+        if fuzzy and (not limit or len(results) < limit):
+            found = {entry.code for entry, _ in results}
+            results.extend(cls.fuzzy_search(query, exclude=found))
+
+        return results[:limit] if limit else results
+
+    @classmethod
+    def _candidates(cls, q: str):
+        if len(q) < 3:
+            # 1-2 harfli so'rovlar uchun trigram yo'q - to'liq ko'rib chiqish
+            return cls._names.keys()
+
+        # Eng kichik posting'dan boshlab kesishma
+        postings = []
+        for gram in _trigrams(q):
+            posting = cls._postings.get(gram)
+            if not posting:
+                return set()
+            postings.append(posting)
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
+
+    @classmethod
+    def fuzzy_search(
+            cls,
+            query: str,
+            limit: int = FUZZY_LIMIT,
+            exclude: set[int] | None = None,
+    ) -> list[tuple[TitleEntry, int]]:
+        """Typo-tolerant qidiruv - butun korpus bitta rapidfuzz chaqiruvida baholanadi
+
+        Returns:
+            List of (entry, score) tuples, score < 90 (substring natijalaridan pastda)
+        """
+        q = utils.default_process(query)
+        if len(q) < 3:
+            return []
+
+        cls._ensure_corpus()
+        exclude = exclude or set()
+        # Bitta kod bir nechta nomga ega bo'lishi mumkin - zaxira bilan olamiz
+        matches = process.extract(
+            q,
+            cls._corpus,
+            scorer=fuzz.WRatio,
+            processor=None,
+            limit=(limit + len(exclude)) * 2,
+            score_cutoff=FUZZY_SCORE_CUTOFF,
+        )
+
+        results = []
+        seen = set(exclude)
+        for _, score, index in matches:
+            code = cls._corpus_codes[index]
+            if code in seen:
+                continue
+            seen.add(code)
+            results.append((cls._entries[code], min(int(score), 89)))
+            if len(results) >= limit:
+                break
+        return results
+
+    @classmethod
+    def _ensure_corpus(cls) -> None:
+        if not cls._corpus_dirty:
+            return
+        corpus, codes = [], []
+        for code, names in cls._names.items():
+            for name in names:
+                corpus.append(utils.default_process(name))
+                codes.append(code)
+        cls._corpus, cls._corpus_codes = corpus, codes
+        cls._corpus_dirty = False
+
+    @staticmethod
+    def _score(name: str, query: str) -> int:
+        # Oddiy scoring - to'liq mos kelsa 100, qisman mos kelsa kamroq
+        if name == query:
+            return 100
+        if name.startswith(query):
+            return 95
+        if query in name:
+            return 90
+        return 0
+
+    @staticmethod
+    def _grams_for(names: tuple[str, ...]) -> set[str]:
+        grams = set()
+        for name in names:
+            grams |= _trigrams(name)
+        return grams
+
+    @staticmethod
+    async def _load_titles(
+            session: AsyncSession,
+            code: int | None = None,
+    ) -> list[tuple[TitleEntry, tuple[str, ...]]]:
+        """Bazadan (entry, barcha nomlar) juftliklarini o'qish
+
+        Serial/mini-serial epizodlari alohida nomga ega bo'lishi mumkin, shuning
+        uchun kod bo'yicha barcha nomlar indekslanadi, ko'rsatish uchun esa
+        birinchi epizod nomi olinadi.
+        """
+        feature_stmt = select(FeatureFilm.code, FeatureFilm.name, FeatureFilm.genres, FeatureFilm.views_count)
+        series_stmt = (
+            select(Series.code, Series.name, Series.genres, Series.views_count)
+            .order_by(Series.code, Series.season, Series.series)
+        )
+        mini_stmt = (
+            select(MiniSeries.code, MiniSeries.name, MiniSeries.genres, MiniSeries.views_count)
+            .order_by(MiniSeries.code, MiniSeries.series)
+        )
+        if code is not None:
+            feature_stmt = feature_stmt.where(FeatureFilm.code == code)
+            series_stmt = series_stmt.where(Series.code == code)
+            mini_stmt = mini_stmt.where(MiniSeries.code == code)
+
+        titles: dict[int, tuple[TitleEntry, list[str]]] = {}
+        views: dict[int, int] = {}
+        for kind, stmt in (("feature_film", feature_stmt), ("mini_series", mini_stmt), ("series", series_stmt)):
+            result = await session.execute(stmt)
+            for row in result.all():
+                normalized = normalize_title(row.name)
+                if row.code not in titles:
+                    titles[row.code] = (TitleEntry(row.code, row.name, kind, tuple(row.genres or ())), [normalized])
+                elif titles[row.code][0].kind != kind:
+                    continue
+                elif normalized not in titles[row.code][1]:
+                    titles[row.code][1].append(normalized)
+                views[row.code] = views.get(row.code, 0) + (row.views_count or 0)
+
+        return [(replace(entry, views=views[entry.code]), tuple(names)) for entry, names in titles.values()]
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+from collections.abc import Iterable
+
+from aiogram import Bot
+
+from src.app.services.cache_service import CacheService
+from src.app.services.op_config import ChannelConfig
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIBED_STATUSES = ("member", "administrator", "creator")
+
+# Bir vaqtda bajariladigan get_chat_member chaqiruvlari (butun jarayon bo'yicha)
+CHECK_CONCURRENCY = 10
+_check_semaphore = asyncio.Semaphore(CHECK_CONCURRENCY)
+
+
+class SubscriptionCache:
+    """(kanal, foydalanuvchi) obuna holati keshi - `sub:{channel_id}:{user_id}`
+
+    Obuna bo'lganlar uzoqroq, obuna bo'lmaganlar qisqa TTL bilan saqlanadi
+    (obuna bo'lgach tezroq o'tib ketishi uchun). `chat_member` yangilanishlari
+    kalitni darhol yangilaydi.
+    """
+
+    KEY_PREFIX = "sub:"
+    POSITIVE_TTL = 600
+    NEGATIVE_TTL = 30
+
+    @classmethod
+    def _key(cls, channel_id: int, user_id: int) -> str:
+        return f"{cls.KEY_PREFIX}{channel_id}:{user_id}"
+
+    @classmethod
+    async def set_status(cls, redis_url: str, channel_id: int, user_id: int, subscribed: bool) -> None:
+        try:
+            redis = await CacheService.get_redis(redis_url)
+            ttl = cls.POSITIVE_TTL if subscribed else cls.NEGATIVE_TTL
+            await redis.set(cls._key(channel_id, user_id), "1" if subscribed else "0", ex=ttl)
+        except Exception as e:
+            logger.error(f"Subscription cache set error for {channel_id}/{user_id}: {e}")
+
+    @classmethod
+    async def get_statuses(cls, redis_url: str, channel_ids: list[int], user_id: int) -> list[bool | None]:
+        """Keshdagi holatlar - bitta MGET; keshda yo'q bo'lsa None"""
+        if not channel_ids:
+            return []
+        try:
+            redis = await CacheService.get_redis(redis_url)
+            values = await redis.mget([cls._key(channel_id, user_id) for channel_id in channel_ids])
+        except Exception as e:
+            logger.error(f"Subscription cache get error for {user_id}: {e}")
+            return [None] * len(channel_ids)
+        return [None if value is None else value == "1" for value in values]
+
+    @classmethod
+    async def is_subscribed(cls, bot: Bot, redis_url: str, channel_id: int, user_id: int) -> bool | None:
+        """Bot API orqali tekshirish va natijani keshlash
+
+        Returns:
+            True/False yoki None (kanal topilmadi, bot chiqarilgan va h.k. - tekshirib bo'lmadi)
+        """
+        try:
+            member = await bot.get_chat_member(channel_id, user_id)
+        except Exception as e:
+            logger.error(f"Error checking channel {channel_id}: {e}")
+            return None
+
+        subscribed = member.status in SUBSCRIBED_STATUSES
+        await cls.set_status(redis_url, channel_id, user_id, subscribed)
+        return subscribed
+
+
+async def get_not_subscribed_channels(bot: Bot, redis_url: str, channels: Iterable[ChannelConfig], user_id: int, force: bool = False) -> list:
+    """Majburiy kanallardan foydalanuvchi obuna bo'lmaganlari
+
+    Keshdagi holatlar bitta MGET bilan olinadi; keshda yo'qlari uchun
+    `get_chat_member` parallel (CHECK_CONCURRENCY cheklovi bilan) chaqiriladi.
+    Tekshirib bo'lmagan kanallar o'tkazib yuboriladi.
+    `force=True` - keshga qaramay qayta tekshirish ("✅" tugmasi uchun).
+    """
+    mandatory = [c for c in channels if c.active]
+    if force:
+        statuses = [None] * len(mandatory)
+    else:
+        statuses = await SubscriptionCache.get_statuses(redis_url, [c.channel_id for c in mandatory], user_id)
+
+    async def check(channel) -> bool | None:
+        async with _check_semaphore:
+            return await SubscriptionCache.is_subscribed(bot, redis_url, channel.channel_id, user_id)
+
+    misses = [i for i, subscribed in enumerate(statuses) if subscribed is None]
+    if misses:
+        checked = await asyncio.gather(*(check(mandatory[i]) for i in misses))
+        for i, subscribed in zip(misses, checked):
+            statuses[i] = subscribed
+
+    return [channel for channel, subscribed in zip(mandatory, statuses) if subscribed is False]
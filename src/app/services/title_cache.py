@@ -0,0 +1,108 @@
+import asyncio
+import dataclasses
+import logging
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.common.lru import LRUCache
+from src.app.database.queries.movie.catalog import CatalogActions, CatalogTitle
+from src.app.services.cache_service import CacheService
+from src.app.services.favorites_cache import FavoritesCache
+
+logger = logging.getLogger(__name__)
+
+
+class TitleCache:
+    """Kod -> kontent (file_id, caption, qismlar soni) keshi
+
+    Ikki qatlam: jarayon ichidagi LRU va Redis. Admin o'zgarishlari
+    `invalidate` orqali aniq kod bo'yicha tozalanadi va Redis pub/sub orqali
+    boshqa worker'larga e'lon qilinadi (`listen` ularning LRU'sidan o'chiradi).
+    """
+
+    KEY_PREFIX = "title:"
+    REDIS_TTL = 600
+    CHANNEL = "title_cache:invalidate"
+    _local = LRUCache(maxsize=2048, ttl=60)
+    _instance_id = uuid.uuid4().hex
+
+    @classmethod
+    def _key(cls, code: int) -> str:
+        return f"{cls.KEY_PREFIX}{code}"
+
+    @classmethod
+    async def get(cls, redis_url: str, code: int) -> CatalogTitle | None:
+        title = cls._local.get(code)
+        if title is not None:
+            return title
+
+        cached = await CacheService.get_cached(redis_url, cls._key(code))
+        if not cached:
+            return None
+        try:
+            title = CatalogTitle(**cached)
+        except TypeError:
+            # Eski formatdagi yozuv - e'tiborsiz qoldiramiz
+            return None
+
+        cls._local.set(code, title)
+        return title
+
+    @classmethod
+    async def set(cls, redis_url: str, title: CatalogTitle) -> None:
+        # "saved" foydalanuvchiga bog'liq - keshga yozilmaydi
+        title = dataclasses.replace(title, saved=False)
+        cls._local.set(title.code, title)
+        await CacheService.set_cached(redis_url, cls._key(title.code), dataclasses.asdict(title), ttl=cls.REDIS_TTL)
+
+    @classmethod
+    async def invalidate(cls, redis_url: str, *codes: int) -> None:
+        for code in codes:
+            cls._local.pop(code)
+            await CacheService.delete_cached(redis_url, cls._key(code))
+
+        if not codes:
+            return
+        try:
+            redis = await CacheService.get_redis(redis_url)
+            await redis.publish(cls.CHANNEL, f"{cls._instance_id}:{','.join(map(str, codes))}")
+        except Exception as e:
+            logger.error(f"Title cache invalidate publish error: {e}")
+
+    @classmethod
+    async def listen(cls, redis_url: str) -> None:
+        """Boshqa worker'lardan kelgan invalidatsiya xabarlarini tinglash"""
+        while True:
+            try:
+                redis = await CacheService.get_redis(redis_url)
+                async with redis.pubsub() as pubsub:
+                    await pubsub.subscribe(cls.CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        sender, _, codes = message["data"].partition(":")
+                        if sender == cls._instance_id:
+                            continue
+                        for code in codes.split(","):
+                            cls._local.pop(int(code))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Title cache listener error: {e}")
+                # Ulanish tiklanguncha o'tkazib yuborilgan xabarlar bo'lishi mumkin
+                cls._local.clear()
+                await asyncio.sleep(5)
+
+    @classmethod
+    async def resolve(cls, session: AsyncSession, redis_url: str, code: int, user_id: int) -> CatalogTitle | None:
+        """Read-through: keshda bo'lsa "saved" sevimlilar keshidan olinadi, aks holda bitta catalog so'rovi"""
+        title = await cls.get(redis_url, code)
+        if title is not None:
+            saved = await FavoritesCache.is_saved(session, redis_url, user_id, code)
+            return dataclasses.replace(title, saved=saved)
+
+        title = await CatalogActions(session).resolve(code, user_id)
+        if title is not None:
+            await cls.set(redis_url, title)
+        return title
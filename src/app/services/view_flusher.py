@@ -0,0 +1,111 @@
+import asyncio
+import logging
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.app.database.queries.movie.feature_films import FeatureFilmsActions
+from src.app.database.queries.movie.mini_series import MiniSeriesActions
+from src.app.database.queries.movie.series import SeriesActions
+from src.app.database.queries.movie.view_buckets import ViewBucketActions
+from src.app.services.view_tracker import ViewTracker
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 30
+
+
+def parse_pending_views(pending: dict) -> tuple[dict, dict, dict]:
+    """`views:pending` hash maydonlarini jadvallar bo'yicha guruhlash
+
+    Returns:
+        (feature, series, mini) - har biri kalit -> qo'shiladigan view soni
+    """
+    feature: dict[int, int] = {}
+    series: dict[tuple[int, int, int], int] = {}
+    mini: dict[tuple[int, int], int] = {}
+
+    for field, count in pending.items():
+        try:
+            parts = field.split(":")
+            kind, ids = parts[2], tuple(int(p) for p in parts[3:])
+            count = int(count)
+        except (IndexError, ValueError):
+            logger.error(f"Malformed pending view field: {field}")
+            continue
+
+        if kind == "feature" and len(ids) == 1:
+            feature[ids[0]] = feature.get(ids[0], 0) + count
+        elif kind == "series" and len(ids) == 3:
+            series[ids] = series.get(ids, 0) + count
+        elif kind == "mini" and len(ids) == 2:
+            mini[ids] = mini.get(ids, 0) + count
+        else:
+            logger.error(f"Unknown pending view field: {field}")
+
+    return feature, series, mini
+
+
+async def flush_pending_views(session_pool: async_sessionmaker, redis_url: str) -> int:
+    """Pending view'larni DB'ga yozish - har bir jadval uchun bitta UPDATE
+
+    Yozib bo'lmagan jadval hisoblari Redis'ga qaytariladi.
+
+    Returns:
+        DB'ga yozilgan view'lar soni
+    """
+    pending = await ViewTracker.drain_pending_views(redis_url)
+    if not pending:
+        return 0
+
+    bucket = ViewBucketActions.bucket_for(datetime.now())
+    feature, series, mini = parse_pending_views(pending)
+    batches = (
+        ("feature", feature, lambda s: FeatureFilmsActions(s).bulk_increment_views(feature)),
+        ("series", series, lambda s: SeriesActions(s).bulk_increment_views(series)),
+        ("mini", mini, lambda s: MiniSeriesActions(s).bulk_increment_views(mini)),
+    )
+
+    flushed = 0
+    # Interval reytinglari uchun soatlik statistika (kod bo'yicha) - faqat yozilgan jadvallardan,
+    # qaytarilgan hisoblar keyingi flush'da yana hisoblanadi
+    per_title: dict[int, int] = {}
+    for kind, counts, apply in batches:
+        if not counts:
+            continue
+        try:
+            async with session_pool() as session:
+                await apply(session)
+            flushed += sum(counts.values())
+            for key, count in counts.items():
+                code = key[0] if isinstance(key, tuple) else key
+                per_title[code] = per_title.get(code, 0) + count
+        except Exception as e:
+            logger.error(f"Error flushing {kind} views: {e}")
+            await ViewTracker.restore_pending_views(
+                redis_url,
+                {field: count for field, count in pending.items() if field.startswith(f"views:pending:{kind}:")},
+            )
+
+    try:
+        async with session_pool() as session:
+            await ViewBucketActions(session).add_views(bucket, per_title)
+    except Exception as e:
+        logger.error(f"Error writing view buckets: {e}")
+
+    return flushed
+
+
+async def pending_views_flusher(session_pool: async_sessionmaker, redis_url: str, interval: int = FLUSH_INTERVAL) -> None:
+    while True:
+        try:
+            await asyncio.sleep(interval)
+            flushed = await flush_pending_views(session_pool, redis_url)
+            if flushed:
+                logger.info(f"Flushed {flushed} pending views")
+        except asyncio.CancelledError:
+            # To'xtatishda oxirgi hisoblarni yozib qo'yamiz
+            await flush_pending_views(session_pool, redis_url)
+            raise
+        except Exception as e:
+            logger.exception(e)
@@ -1,7 +1,13 @@
+from datetime import date, timedelta
+from hashlib import blake2b
 from redis.asyncio import Redis
 from typing import Optional
 import logging
 
+from redis.commands.core import AsyncScript
+
+from src.app.services.leaderboard import Leaderboard, VIEWS_TOTAL_KEY, views_day_key
+
 logger = logging.getLogger(__name__)
 
 
@@ -9,6 +15,62 @@ class ViewTracker:
     """View tracking xizmati - Redis connection pool bilan"""
     
     _redis_pool: Optional[Redis] = None
+    _record_view_script: Optional[AsyncScript] = None
+    _drain_script: Optional[AsyncScript] = None
+
+    # Kunlik dedup: har kun uchun bitta Bloom filter (Redis bitmap).
+    # Xotira foydalanuvchi x film juftliklari soniga emas, BLOOM_BITS ga bog'liq:
+    # 2^25 bit = 4 MB/kun, k=7 da ~3.5 mln juftlikgacha false positive ~1%.
+    # False positive - yangi ko'rish hisoblanmay qolishi (kam hisoblash), ortiqcha emas.
+    BLOOM_BITS = 1 << 25
+    BLOOM_HASHES = 7
+    DAY_TTL = 2 * 86400
+
+    # KEYS[1] - kunlik bloom, KEYS[2] - pending hash, KEYS[3] - kunlik HLL (film bo'yicha),
+    # KEYS[4] - leaderboard kunlik views zset, KEYS[5] - leaderboard umumiy views zset
+    # ARGV[1] - TTL, ARGV[2] - pending maydoni ('' bo'lsa increment yo'q), ARGV[3] - user_id,
+    # ARGV[4] - film kodi, ARGV[5] - leaderboard kunlik zset TTL, ARGV[6..] - bloom bit pozitsiyalari
+    RECORD_VIEW_LUA = """
+    redis.call('PFADD', KEYS[3], ARGV[3])
+    redis.call('EXPIRE', KEYS[3], ARGV[1])
+
+    local seen = true
+    for i = 6, #ARGV do
+        if redis.call('GETBIT', KEYS[1], ARGV[i]) == 0 then
+            seen = false
+            break
+        end
+    end
+    if seen then
+        return 0
+    end
+
+    for i = 6, #ARGV do
+        redis.call('SETBIT', KEYS[1], ARGV[i], 1)
+    end
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+    if ARGV[2] ~= '' then
+        redis.call('HINCRBY', KEYS[2], ARGV[2], 1)
+        redis.call('ZINCRBY', KEYS[4], 1, ARGV[4])
+        redis.call('EXPIRE', KEYS[4], ARGV[5])
+        redis.call('ZINCRBY', KEYS[5], 1, ARGV[4])
+    end
+    return 1
+    """
+
+    # KEYS[1] - pending hash, KEYS[2] - draining hash
+    # Bitta skript: bir nechta jarayon flusher'i bir-birining draining hash'ini bosib keta olmaydi
+    DRAIN_LUA = """
+    if redis.call('EXISTS', KEYS[2]) == 0 then
+        if redis.call('EXISTS', KEYS[1]) == 0 then
+            return {}
+        end
+        redis.call('RENAME', KEYS[1], KEYS[2])
+    end
+    local entries = redis.call('HGETALL', KEYS[2])
+    redis.call('DEL', KEYS[2])
+    return entries
+    """
     
     @classmethod
     async def get_redis(cls, redis_url: str) -> Redis:
@@ -30,6 +92,85 @@ class ViewTracker:
         if cls._redis_pool:
             await cls._redis_pool.close()
             cls._redis_pool = None
+            cls._record_view_script = None
+            cls._drain_script = None
+    
+    @staticmethod
+    def _pending_field(movie_code: int, movie_type: str, season: int = None, series: int = None) -> Optional[str]:
+        """`views:pending` hash maydoni nomi"""
+        if movie_type == "feature":
+            return f"views:pending:feature:{movie_code}"
+        if movie_type == "series":
+            return f"views:pending:series:{movie_code}:{season}:{series}"
+        if movie_type == "mini_series":
+            return f"views:pending:mini:{movie_code}:{series}"
+        return None
+    
+    @classmethod
+    def _bloom_positions(cls, user_id: int, movie_code: int) -> list[int]:
+        """Double hashing: h1 + i*h2 - bitta blake2b digest'dan k ta pozitsiya"""
+        digest = blake2b(f"{user_id}:{movie_code}".encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % cls.BLOOM_BITS for i in range(cls.BLOOM_HASHES)]
+    
+    @staticmethod
+    def _day_key(prefix: str, day: date, movie_code: int = None) -> str:
+        suffix = day.strftime("%Y%m%d")
+        return f"{prefix}:{suffix}" if movie_code is None else f"{prefix}:{movie_code}:{suffix}"
+    
+    @classmethod
+    async def _mark_view(cls, redis_url: str, user_id: int, movie_code: int, field: str) -> bool:
+        redis = await cls.get_redis(redis_url)
+        if cls._record_view_script is None:
+            # EVALSHA ishlatiladi, skript yo'q bo'lsa redis-py o'zi EVAL qiladi
+            cls._record_view_script = redis.register_script(cls.RECORD_VIEW_LUA)
+
+        today = date.today()
+        recorded = await cls._record_view_script(
+            keys=[
+                cls._day_key("views:bloom", today),
+                "views:pending",
+                cls._day_key("views:uniq", today, movie_code),
+                views_day_key(today),
+                VIEWS_TOTAL_KEY,
+            ],
+            args=[
+                cls.DAY_TTL,
+                field,
+                user_id,
+                movie_code,
+                Leaderboard.DAY_KEY_TTL,
+                *cls._bloom_positions(user_id, movie_code),
+            ],
+        )
+        return bool(recorded)
+    
+    @classmethod
+    async def record_view(
+        cls,
+        redis_url: str,
+        user_id: int,
+        movie_code: int,
+        movie_type: str,
+        season: int = None,
+        series: int = None,
+    ) -> bool:
+        """Ko'rishni qayd qilish: dedup tekshiruvi va pending increment bitta Lua chaqiruvida
+
+        Returns:
+            True - yangi ko'rish hisoblandi, False - bugun allaqachon ko'rgan
+        """
+        field = cls._pending_field(movie_code, movie_type, season, series)
+        if field is None:
+            logger.error(f"Unknown movie type: {movie_type}")
+            return False
+
+        try:
+            return await cls._mark_view(redis_url, user_id, movie_code, field)
+        except Exception as e:
+            logger.error(f"ViewTracker error for user {user_id}, movie {movie_code}: {e}")
+            return False
     
     @classmethod
     async def is_new_view(cls, redis_url: str, user_id: int, movie_code: int) -> bool:
@@ -44,14 +185,29 @@ class ViewTracker:
             True - yangi ko'rish, False - bugun allaqachon ko'rgan
         """
         try:
-            redis = await cls.get_redis(redis_url)
-            key = f"view:{user_id}:{movie_code}"
-            is_set = await redis.set(key, "1", ex=86400, nx=True)
-            return bool(is_set)
+            return await cls._mark_view(redis_url, user_id, movie_code, "")
         except Exception as e:
             logger.error(f"ViewTracker error for user {user_id}, movie {movie_code}: {e}")
             return False  # Xatolik bo'lsa, view count oshmasin
     
+    @classmethod
+    async def get_unique_viewers(cls, redis_url: str, movie_code: int, days: int = 1) -> int:
+        """Film bo'yicha taxminiy unikal tomoshabinlar soni (HyperLogLog, ~0.8% xato)
+
+        Args:
+            redis_url: Redis URL
+            movie_code: Film kodi
+            days: Necha kunlik (bugundan orqaga); DAY_TTL dan uzun tarix saqlanmaydi
+        """
+        try:
+            redis = await cls.get_redis(redis_url)
+            today = date.today()
+            keys = [cls._day_key("views:uniq", today - timedelta(days=i), movie_code) for i in range(days)]
+            return await redis.pfcount(*keys)
+        except Exception as e:
+            logger.error(f"Unique viewers error for movie {movie_code}: {e}")
+            return 0
+    
     @classmethod
     async def increment_pending_view(cls, redis_url: str, movie_code: int, movie_type: str, season: int = None, series: int = None):
         """Pending view'ni Redis'da increment qilish (batch update uchun)
@@ -66,13 +222,8 @@ class ViewTracker:
         try:
             redis = await cls.get_redis(redis_url)
             
-            if movie_type == "feature":
-                key = f"views:pending:feature:{movie_code}"
-            elif movie_type == "series":
-                key = f"views:pending:series:{movie_code}:{season}:{series}"
-            elif movie_type == "mini_series":
-                key = f"views:pending:mini:{movie_code}:{series}"
-            else:
+            key = cls._pending_field(movie_code, movie_type, season, series)
+            if key is None:
                 logger.error(f"Unknown movie type: {movie_type}")
                 return
             
@@ -99,3 +250,36 @@ class ViewTracker:
             await redis.delete("views:pending")
         except Exception as e:
             logger.error(f"Clear pending views error: {e}")
+    
+    @classmethod
+    async def drain_pending_views(cls, redis_url: str) -> dict:
+        """Pending view'larni atomik ravishda olib, hash'ni bo'shatish
+
+        Tekshirish, RENAME, HGETALL va DEL bitta Lua skriptida bajariladi:
+        flush vaqtida kelgan yangi view'lar yangi `views:pending` hash'iga
+        yoziladi, parallel flusher'lar esa bir-birining hisobini yo'qotmaydi.
+        """
+        try:
+            redis = await cls.get_redis(redis_url)
+            if cls._drain_script is None:
+                cls._drain_script = redis.register_script(cls.DRAIN_LUA)
+
+            entries = await cls._drain_script(keys=["views:pending", "views:pending:draining"])
+            return dict(zip(entries[::2], entries[1::2]))
+        except Exception as e:
+            logger.error(f"Drain pending views error: {e}")
+            return {}
+    
+    @classmethod
+    async def restore_pending_views(cls, redis_url: str, pending: dict):
+        """DB'ga yozib bo'lmagan view'larni pending hash'ga qaytarish"""
+        if not pending:
+            return
+        try:
+            redis = await cls.get_redis(redis_url)
+            async with redis.pipeline(transaction=False) as pipe:
+                for key, count in pending.items():
+                    pipe.hincrby("views:pending", key, int(count))
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Restore pending views error: {e}")
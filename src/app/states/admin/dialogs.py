@@ -6,6 +6,7 @@ class AdminMenuSG(StatesGroup):
     statistics = State()
     broadcast_input = State()
     broadcast_confirm = State()
+    broadcast_status = State()
 
 
 class BackupSG(StatesGroup):